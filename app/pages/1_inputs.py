@@ -12,8 +12,15 @@ if str(project_root) not in sys.path:
 import streamlit as st
 from pathlib import Path
 from app.components.sidebar import render_sidebar
-from app.state import get_project_path, stage_file_exists
-from app.utils import capture_stdout_to_streamlit, show_process_log
+from app.state import get_project_path
+from app.utils import (
+    capture_stdout_to_streamlit,
+    show_process_log,
+    count_words,
+    read_text_cached,
+    is_youtube_url,
+    require_project
+)
 
 
 # Page config
@@ -27,15 +34,9 @@ st.set_page_config(
 render_sidebar()
 
 # Main content
-def main():
+@require_project
+def main(project_name):
     """Inputs page main content."""
-
-    # Check if project is selected
-    if not st.session_state.get("current_project"):
-        st.warning("👈 Please select or create a project first")
-        return
-
-    project_name = st.session_state.current_project
     project_path = get_project_path(project_name)
 
     # Page header
@@ -43,8 +44,9 @@ def main():
     st.markdown(f"**Project:** {project_name}")
     st.markdown("---")
 
-    # Check if transcript already exists
-    transcript_exists = (project_path / "0_transcript.txt").exists()
+    # Check if transcript already exists (checked once; both tabs reuse the result)
+    transcript_file = project_path / "0_transcript.txt"
+    transcript_exists = transcript_file.exists()
 
     if transcript_exists:
         st.info("✅ Transcript already exists. Go to **Script** page to generate your YouTube script.")
@@ -62,27 +64,32 @@ def main():
         This will be saved as the transcript. Then go to the **Script** page to generate a YouTube script from it.
         """)
 
-        text_content = st.text_area(
-            "Text Content",
-            height=300,
-            placeholder="Paste your article, blog post, or raw transcript here...",
-            help="Maximum 10,000 characters recommended",
-            key="text_input"
-        )
+        # A form batches the paste: nothing reruns until the save button is pressed
+        with st.form("paste_text_form", border=False):
+            text_content = st.text_area(
+                "Text Content",
+                height=300,
+                placeholder="Paste your article, blog post, or raw transcript here...",
+                help="Maximum 10,000 characters recommended",
+                key="text_input"
+            )
 
-        char_count = len(text_content) if text_content else 0
-        st.caption(f"Characters: {char_count:,}")
+            submitted = st.form_submit_button("💾 Save as Transcript", type="primary")
 
-        if st.button("💾 Save as Transcript", key="save_text_btn", type="primary"):
+        if submitted:
             if text_content and text_content.strip():
                 # Save to 0_transcript.txt
-                transcript_file = project_path / "0_transcript.txt"
                 transcript_file.parent.mkdir(parents=True, exist_ok=True)
 
+                content = text_content.strip()
                 with open(transcript_file, 'w', encoding='utf-8') as f:
-                    f.write(text_content.strip())
+                    f.write(content)
+                transcript_exists = True
 
-                st.success(f"✅ Saved to `0_transcript.txt` ({len(text_content.strip().split())} words)")
+                st.success(
+                    f"✅ Saved to `0_transcript.txt` "
+                    f"({len(content.split()):,} words, {len(content):,} characters)"
+                )
                 st.info("👉 Go to **Script** page to generate your YouTube script")
 
             else:
@@ -95,16 +102,14 @@ def main():
         """)
 
         # Show existing transcript if present
-        transcript_file = project_path / "0_transcript.txt"
-        if transcript_file.exists():
-            transcript_text = transcript_file.read_text(encoding='utf-8')
-            word_count = len(transcript_text.split())
+        if transcript_exists:
+            word_count = count_words(transcript_file)
             st.success(f"✅ Transcript ready — {word_count:,} words")
             st.info("👉 Go to **Script** page to generate your script from this transcript")
             with st.expander("📄 View Transcript", expanded=False):
                 st.text_area(
                     "Transcript content",
-                    value=transcript_text,
+                    value=read_text_cached(transcript_file),
                     height=400,
                     disabled=True,
                     label_visibility="collapsed"
@@ -116,7 +121,7 @@ def main():
             key="youtube_url_input"
         )
 
-        url_valid = youtube_url and ("youtube.com/watch" in youtube_url or "youtu.be/" in youtube_url)
+        url_valid = is_youtube_url(youtube_url)
 
         if st.button("🎥 Transcribe Video", key="transcribe_btn", disabled=not url_valid, type="primary"):
             # Force-load .env from project root so GOOGLE_STT_BUCKET etc. are available
@@ -125,7 +130,7 @@ def main():
 
             from src.transcription import transcribe_youtube_audio
 
-            transcript_path = str(project_path / "0_transcript.txt")
+            transcript_path = str(transcript_file)
 
             project_path.mkdir(parents=True, exist_ok=True)
 
@@ -14,12 +14,17 @@ from pathlib import Path
 from app.components.sidebar import render_sidebar
 from app.state import (
     get_project_path,
-    stage_file_exists,
-    get_approval_status,
+    get_all_stages_status,
     set_approval
 )
-from app.utils import capture_stdout_to_streamlit, show_process_log
-from src.summarization import summarize_transcript
+from app.utils import (
+    capture_stdout_to_streamlit,
+    show_process_log,
+    count_words,
+    read_text_cached,
+    read_text_as_html,
+    require_project
+)
 from src.utils.config import (
     get_summarization_llm,
     get_available_summarization_llms,
@@ -37,16 +42,24 @@ st.set_page_config(
 # Render sidebar
 render_sidebar()
 
+# Static chrome for the view-mode script preview; only the body is filled in per rerun
+SCRIPT_PREVIEW_HTML = """
+<div style="
+    background-color: #f8f9fa;
+    padding: 2rem;
+    border-radius: 0.5rem;
+    border-left: 4px solid #FF6B35;
+    max-height: 500px;
+    overflow-y: auto;
+">
+    {body}
+</div>
+"""
 
-def main():
-    """Script page main content."""
-
-    # Check if project is selected
-    if not st.session_state.get("current_project"):
-        st.warning("👈 Please select or create a project first")
-        return
 
-    project_name = st.session_state.current_project
+@require_project
+def main(project_name):
+    """Script page main content."""
     project_path = get_project_path(project_name)
     script_file = project_path / "1_summary.txt"
     transcript_file = project_path / "0_transcript.txt"
@@ -89,21 +102,21 @@ def main():
     
     st.markdown("---")
 
-    # Check if script exists
-    script_exists = stage_file_exists(project_name, "script")
+    # Check if script exists (status is cached until the project changes on disk)
+    script_status = get_all_stages_status(project_name)["script"]
+    script_exists = script_status["exists"]
 
     if not script_exists:
         # Check if transcript exists
         if transcript_file.exists():
-            transcript_text = transcript_file.read_text(encoding='utf-8')
-            word_count = len(transcript_text.split())
+            word_count = count_words(transcript_file)
 
             st.success(f"✅ Transcript ready — **{word_count:,} words** (`0_transcript.txt`)")
 
             with st.expander("📄 View Transcript", expanded=False):
                 st.text_area(
                     "Transcript content",
-                    value=transcript_text,
+                    value=read_text_cached(transcript_file),
                     height=300,
                     disabled=True,
                     label_visibility="collapsed"
@@ -114,6 +127,9 @@ def main():
             st.markdown("Generate a polished YouTube script from your transcript using AI summarization.")
 
             if st.button("🎬 Create YouTube Script", key="gen_script_btn", type="primary", use_container_width=True):
+                # Imported here so reruns don't pay for loading LangChain/Gemini
+                from src.summarization import summarize_transcript
+
                 log_container = st.empty()
                 with st.spinner("Generating YouTube script from transcript..."):
                     try:
@@ -135,15 +151,14 @@ def main():
 
         return
 
-    # Load script content
-    with open(script_file, 'r', encoding='utf-8') as f:
-        script_content = f.read()
+    # Load script content (reused across reruns until the file changes)
+    script_content = read_text_cached(script_file)
 
     # Get approval status
-    is_approved = get_approval_status(project_name, "script")
+    is_approved = script_status["approved"]
 
-    # Stats
-    word_count = len(script_content.split())
+    # Stats (word count is cached per file version, like the content)
+    word_count = count_words(script_file)
     char_count = len(script_content)
     estimated_duration = word_count / 150  # ~150 words per minute
 
@@ -182,11 +197,11 @@ def main():
         col1, col2 = st.columns([1, 5])
         with col1:
             if st.button("💾 Save Changes", key="save_script_btn", type="primary"):
-                with open(script_file, 'w', encoding='utf-8') as f:
-                    f.write(edited_content)
-
-                # Reset approval if content changed
+                # Only write (and reset approval) if content changed, so a no-op
+                # save doesn't bump the file's mtime and invalidate cached reads
                 if edited_content != script_content:
+                    with open(script_file, 'w', encoding='utf-8') as f:
+                        f.write(edited_content)
                     set_approval(project_name, "script", False)
                     st.success("✅ Changes saved! Please re-approve the script.")
                 else:
@@ -197,6 +212,8 @@ def main():
         with col2:
             if st.button("🔄 Regenerate Script", key="regen_script_btn"):
                 if transcript_file.exists():
+                    from src.summarization import summarize_transcript
+
                     log_container = st.empty()
                     with st.spinner("Regenerating script..."):
                         try:
@@ -214,19 +231,11 @@ def main():
                     st.error("❌ Transcript not found. Cannot regenerate.")
 
     else:
-        # View mode - display as markdown
-        st.markdown(f"""
-        <div style="
-            background-color: #f8f9fa;
-            padding: 2rem;
-            border-radius: 0.5rem;
-            border-left: 4px solid #FF6B35;
-            max-height: 500px;
-            overflow-y: auto;
-        ">
-            {script_content.replace('\n', '<br>')}
-        </div>
-        """, unsafe_allow_html=True)
+        # View mode - display as HTML (script text is escaped, so edits can't inject markup)
+        st.markdown(
+            SCRIPT_PREVIEW_HTML.format(body=read_text_as_html(script_file)),
+            unsafe_allow_html=True
+        )
 
     st.markdown("---")
 
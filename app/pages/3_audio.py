@@ -14,13 +14,12 @@ from pathlib import Path
 from app.components.sidebar import render_sidebar
 from app.state import (
     get_project_path,
-    stage_file_exists,
-    get_approval_status,
+    get_all_stages_status,
     set_approval
 )
-from app.utils import capture_stdout_to_streamlit, show_process_log
-from src.text_to_speech import synthesize_speech
+from app.utils import capture_stdout_to_streamlit, show_process_log, read_media_cached, require_project
 from src.utils.config import (
+    get_config_path,
     get_tts_voice,
     get_tts_lang,
     get_available_tts_voices,
@@ -39,15 +38,36 @@ st.set_page_config(
 render_sidebar()
 
 
-def main():
-    """Audio page main content."""
-
-    # Check if project is selected
-    if not st.session_state.get("current_project"):
-        st.warning("👈 Please select or create a project first")
-        return
+@st.cache_data(show_spinner=False, max_entries=4)
+def _load_voice_catalog(config_mtime_ns: int) -> dict:
+    """
+    Voice list and current selection from config/config.json, with the
+    selectbox options prebuilt (cached until config.json changes, e.g. on
+    set_tts_voice).
+    """
+    available_voices = get_available_tts_voices()
 
-    project_name = st.session_state.current_project
+    # Lookups for the selectbox, so picking a voice needs no list scans
+    # (first match wins, as with list.index())
+    index_by_id = {}
+    ids_by_label = {}
+    for i, v in enumerate(available_voices):
+        index_by_id.setdefault(v["id"], i)
+        ids_by_label.setdefault(v["label"], v["id"])
+
+    return {
+        "voices": {v["id"]: v for v in available_voices},
+        "labels": [v["label"] for v in available_voices],
+        "index_by_id": index_by_id,
+        "ids_by_label": ids_by_label,
+        "current_voice_id": get_tts_voice(),
+        "current_lang": get_tts_lang(),
+    }
+
+
+@require_project
+def main(project_name):
+    """Audio page main content."""
     project_path = get_project_path(project_name)
     script_file = project_path / "1_summary.txt"
     audio_file = project_path / "2_audio.mp3"
@@ -57,9 +77,10 @@ def main():
     st.markdown(f"**Project:** {project_name}")
     st.markdown("---")
 
-    # Check prerequisites
-    script_exists = stage_file_exists(project_name, "script")
-    script_approved = get_approval_status(project_name, "script")
+    # Check prerequisites (one cached status lookup covers every stage)
+    stages_status = get_all_stages_status(project_name)
+    script_exists = stages_status["script"]["exists"]
+    script_approved = stages_status["script"]["approved"]
 
     if not script_exists:
         st.error("❌ **Script not found**")
@@ -74,34 +95,26 @@ def main():
     # Voice Configuration Section
     st.markdown("## 🎤 Voice Configuration")
 
-    # Get available voices
-    available_voices = get_available_tts_voices()
-    current_voice_id = get_tts_voice()
-    current_lang = get_tts_lang()
-
-    # Create voice selector
-    voice_options = {v["id"]: v["label"] for v in available_voices}
-    voice_labels = list(voice_options.values())
-    voice_ids = list(voice_options.keys())
+    # Get available voices (reused across reruns until config.json changes)
+    voice_catalog = _load_voice_catalog(get_config_path().stat().st_mtime_ns)
+    current_voice_id = voice_catalog["current_voice_id"]
+    current_lang = voice_catalog["current_lang"]
 
-    # Find current voice index
-    try:
-        current_index = voice_ids.index(current_voice_id)
-    except ValueError:
-        current_index = 0
+    # Create voice selector, starting at the current voice
+    current_index = voice_catalog["index_by_id"].get(current_voice_id, 0)
 
     selected_label = st.selectbox(
         "Select Voice",
-        voice_labels,
+        voice_catalog["labels"],
         index=current_index,
         key="voice_selector"
     )
 
     # Get selected voice ID
-    selected_voice_id = voice_ids[voice_labels.index(selected_label)]
+    selected_voice_id = voice_catalog["ids_by_label"][selected_label]
 
     # Display voice info
-    selected_voice_info = next((v for v in available_voices if v["id"] == selected_voice_id), None)
+    selected_voice_info = voice_catalog["voices"].get(selected_voice_id)
     if selected_voice_info:
         col1, col2 = st.columns([3, 1])
         with col1:
@@ -116,8 +129,8 @@ def main():
     st.markdown("---")
 
     # Check if audio exists
-    audio_exists = stage_file_exists(project_name, "audio")
-    is_approved = get_approval_status(project_name, "audio")
+    audio_exists = stages_status["audio"]["exists"]
+    is_approved = stages_status["audio"]["approved"]
 
     # Audio Generation Section
     st.markdown("## 🎙️ Audio Generation")
@@ -126,6 +139,9 @@ def main():
         st.info("💡 Click the button below to generate narration audio from your script")
 
         if st.button("🎵 Generate Audio", key="gen_audio_btn", type="primary", use_container_width=True):
+            # Imported here so reruns don't pay for loading Google TTS/pydub
+            from src.text_to_speech import synthesize_speech
+
             log_container = st.empty()
             with st.spinner(f"Generating audio with {selected_voice_info['label']}..."):
                 try:
@@ -166,11 +182,8 @@ def main():
         with col3:
             st.metric("Voice", selected_voice_info['label'] if selected_voice_info else "Unknown")
 
-        # Play audio
-        with open(audio_file, 'rb') as f:
-            audio_bytes = f.read()
-
-        st.audio(audio_bytes, format='audio/mp3')
+        # Play audio (read once per file version, not on every rerun)
+        st.audio(read_media_cached(audio_file), format='audio/mp3')
 
         st.markdown("---")
 
@@ -184,6 +197,8 @@ def main():
 
         with col2:
             if st.button("🔄 Regenerate Audio", key="regen_audio_btn"):
+                from src.text_to_speech import synthesize_speech
+
                 log_container = st.empty()
                 with st.spinner("Regenerating audio..."):
                     try:
@@ -15,12 +15,18 @@ from pathlib import Path
 from app.components.sidebar import render_sidebar
 from app.state import (
     get_project_path,
-    stage_file_exists,
-    get_approval_status,
+    get_all_stages_status,
     set_approval
 )
-from app.utils import capture_stdout_to_streamlit, show_process_log
-from src.metadata_generation import generate_metadata, regenerate_titles, regenerate_description
+from app.utils import (
+    capture_stdout_to_streamlit,
+    show_process_log,
+    read_text_cached,
+    read_json_cached,
+    read_bytes_cached,
+    write_json_atomic,
+    require_project
+)
 from src.utils.config import (
     get_prompting_llm,
     get_available_prompting_llms,
@@ -42,15 +48,9 @@ st.set_page_config(
 render_sidebar()
 
 
-def main():
+@require_project
+def main(project_name):
     """Metadata page main content."""
-
-    # Check if project is selected
-    if not st.session_state.get("current_project"):
-        st.warning("👈 Please select or create a project first")
-        return
-
-    project_name = st.session_state.current_project
     project_path = get_project_path(project_name)
     script_file = project_path / "1_summary.txt"
     metadata_file = project_path / "4_metadata.json"
@@ -94,9 +94,10 @@ def main():
     
     st.markdown("---")
 
-    # Check prerequisites
-    script_exists = stage_file_exists(project_name, "script")
-    script_approved = get_approval_status(project_name, "script")
+    # Check prerequisites (one cached status lookup covers every stage)
+    stages_status = get_all_stages_status(project_name)
+    script_exists = stages_status["script"]["exists"]
+    script_approved = stages_status["script"]["approved"]
 
     if not script_exists or not script_approved:
         st.warning("⚠️ **Script must be approved first**")
@@ -104,8 +105,8 @@ def main():
         return
 
     # Check if metadata exists
-    metadata_exists = stage_file_exists(project_name, "metadata")
-    is_approved = get_approval_status(project_name, "metadata")
+    metadata_exists = stages_status["metadata"]["exists"]
+    is_approved = stages_status["metadata"]["approved"]
 
     # Metadata Generation Section
     st.markdown("## 📝 Generate Metadata")
@@ -114,6 +115,9 @@ def main():
         st.info("💡 Generate YouTube-optimized titles, descriptions, and hashtags from your script")
 
         if st.button("🤖 Generate Metadata", key="gen_metadata_btn", type="primary", use_container_width=True):
+            # Imported here so reruns don't pay for loading LangChain/Gemini
+            from src.metadata_generation import generate_metadata
+
             log_container = st.empty()
             with st.spinner("Generating metadata with AI..."):
                 try:
@@ -132,19 +136,16 @@ def main():
                     st.exception(e)
 
     else:
-        # Load and parse metadata
+        # Load and parse metadata (parsed once, reused across reruns until the file changes)
         try:
-            with open(metadata_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-
             # Try to parse as JSON first
             try:
-                metadata = json.loads(content)
+                metadata = read_json_cached(metadata_file)
             except json.JSONDecodeError:
                 # Fallback: parse as plain text
                 metadata = {
                     "titles": [],
-                    "description": content,
+                    "description": read_text_cached(metadata_file),
                     "hashtags": []
                 }
 
@@ -154,6 +155,8 @@ def main():
                 st.markdown("### 📌 Title Options")
             with col_regen:
                 if st.button("🔄", key="regen_titles_btn", help="Regenerate titles"):
+                    from src.metadata_generation import regenerate_titles
+
                     log_container = st.empty()
                     with st.spinner("Regenerating titles..."):
                         try:
@@ -183,6 +186,8 @@ def main():
                 st.markdown("### 📄 Description")
             with col_regen_desc:
                 if st.button("🔄", key="regen_desc_btn", help="Regenerate description"):
+                    from src.metadata_generation import regenerate_description
+
                     log_container = st.empty()
                     with st.spinner("Regenerating description..."):
                         try:
@@ -213,8 +218,7 @@ def main():
                     if edited_description != description:
                         if st.button("💾 Save Description", key="save_desc_btn"):
                             metadata["description"] = edited_description
-                            with open(metadata_file, 'w', encoding='utf-8') as f:
-                                json.dump(metadata, f, indent=2)
+                            write_json_atomic(metadata_file, metadata)
                             st.success("✅ Description saved!")
                             set_approval(project_name, "metadata", False)
                             st.rerun()
@@ -300,8 +304,7 @@ def main():
                 thumbnail_metadata_file = project_path / "4_thumbnail_metadata.json"
                 if thumbnail_metadata_file.exists():
                     try:
-                        with open(thumbnail_metadata_file, 'r', encoding='utf-8') as f:
-                            thumb_meta = json.load(f)
+                        thumb_meta = read_json_cached(thumbnail_metadata_file)
                         
                         st.markdown(f"**Text Overlay:** {thumb_meta.get('thumbnail_text', 'N/A')}")
                         
@@ -310,9 +313,8 @@ def main():
                     except:
                         pass
                 
-                # Download button
-                with open(thumbnail_file, 'rb') as f:
-                    thumbnail_bytes = f.read()
+                # Download button (bytes are reused across reruns until the thumbnail changes)
+                thumbnail_bytes = read_bytes_cached(thumbnail_file)
                 
                 col1, col2 = st.columns([1, 1])
                 with col1:
@@ -357,6 +359,8 @@ def main():
 
             with col2:
                 if st.button("🔄 Regenerate", key="regen_metadata_btn"):
+                    from src.metadata_generation import generate_metadata
+
                     log_container = st.empty()
                     with st.spinner("Regenerating metadata..."):
                         try:
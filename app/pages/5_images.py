@@ -14,13 +14,17 @@ from pathlib import Path
 from app.components.sidebar import render_sidebar
 from app.state import (
     get_project_path,
-    stage_file_exists,
-    get_approval_status,
+    get_all_stages_status,
     set_approval
 )
-from app.utils import capture_stdout_to_streamlit, show_process_log
-from src.image_prompting import generate_image_prompts
-from src.image_creation import create_images_from_prompts
+from app.utils import (
+    capture_stdout_to_streamlit,
+    show_process_log,
+    read_text_cached,
+    list_files,
+    image_thumbnails,
+    require_project
+)
 from src.utils.config import (
     get_prompting_llm,
     get_available_prompting_llms,
@@ -42,15 +46,9 @@ st.set_page_config(
 render_sidebar()
 
 
-def main():
+@require_project
+def main(project_name):
     """Images page main content."""
-
-    # Check if project is selected
-    if not st.session_state.get("current_project"):
-        st.warning("👈 Please select or create a project first")
-        return
-
-    project_name = st.session_state.current_project
     project_path = get_project_path(project_name)
     script_file = project_path / "1_summary.txt"
     audio_file = project_path / "2_audio.mp3"
@@ -122,8 +120,9 @@ def main():
     st.markdown("---")
 
     # Check prerequisites
-    audio_exists = stage_file_exists(project_name, "audio")
-    audio_approved = get_approval_status(project_name, "audio")
+    stages_status = get_all_stages_status(project_name)
+    audio_exists = stages_status["audio"]["exists"]
+    audio_approved = stages_status["audio"]["approved"]
 
     if not audio_exists or not audio_approved:
         st.warning("⚠️ **Audio must be approved first**")
@@ -139,6 +138,9 @@ def main():
         st.info("💡 Generate AI prompts for images that will sync with your audio")
 
         if st.button("🤖 Generate Image Prompts", key="gen_prompts_btn", type="primary", use_container_width=True):
+            # Imported here so reruns don't pay for loading LangChain/Gemini
+            from src.image_prompting import generate_image_prompts
+
             log_container = st.empty()
             with st.spinner("Generating image prompts from script..."):
                 try:
@@ -157,9 +159,8 @@ def main():
                     st.exception(e)
 
     else:
-        # Display prompts
-        with open(prompts_file, 'r', encoding='utf-8') as f:
-            prompts_content = f.read()
+        # Display prompts (file read is reused across reruns until it changes)
+        prompts_content = read_text_cached(prompts_file)
 
         prompts_list = [p.strip() for p in prompts_content.split('\n') if p.strip()]
 
@@ -176,6 +177,8 @@ def main():
             st.success(f"✅ {len(prompts_list)} image prompts ready")
         with col2:
             if st.button("🔄 Regenerate", key="regen_prompts_btn"):
+                from src.image_prompting import generate_image_prompts
+
                 log_container = st.empty()
                 with st.spinner("Regenerating prompts..."):
                     try:
@@ -195,7 +198,9 @@ def main():
         # Step 2: Generate Images
         st.markdown("## 🎨 Step 2: Generate Images")
 
-        images_exist = images_dir.exists() and any(images_dir.glob("*.png"))
+        # Listing is reused across reruns until files are added to or removed from the folder
+        image_files = list_files(images_dir, ".png")
+        images_exist = bool(image_files)
 
         if not images_exist:
             st.info(f"💡 Generate {len(prompts_list)} AI images using Vertex AI Imagen")
@@ -203,6 +208,8 @@ def main():
             st.warning("⚠️ **Note:** Image generation can take 5-10 minutes depending on the number of images")
 
             if st.button("🎨 Generate Images", key="gen_images_btn", type="primary", use_container_width=True):
+                from src.image_creation import create_images_from_prompts
+
                 log_container = st.empty()
                 with st.spinner(f"Generating {len(prompts_list)} images... This may take several minutes..."):
                     try:
@@ -224,20 +231,26 @@ def main():
             # Display Images Gallery
             st.markdown("### 🖼️ Image Gallery")
 
-            image_files = sorted(images_dir.glob("*.png"))
-
             col1, col2 = st.columns([5, 1])
             with col1:
                 st.success(f"✅ {len(image_files)} images generated")
             with col2:
+                only_missing = st.checkbox(
+                    "Only missing",
+                    key="regen_only_missing",
+                    help="Keep existing images and only generate the ones that failed or are missing"
+                )
                 if st.button("🔄 Regenerate", key="regen_images_btn"):
+                    from src.image_creation import create_images_from_prompts
+
                     log_container = st.empty()
                     with st.spinner("Regenerating images..."):
                         try:
                             with capture_stdout_to_streamlit(log_container, session_key="images_gen_log"):
                                 create_images_from_prompts(
                                     str(prompts_file),
-                                    str(images_dir)
+                                    str(images_dir),
+                                    skip_existing=only_missing
                                 )
 
                             # Reset approval
@@ -251,7 +264,8 @@ def main():
 
             st.markdown("---")
 
-            # Display images in grid
+            # Display images in grid (previews are built in parallel, once per set of images)
+            thumbnails = image_thumbnails(image_files)
             cols_per_row = 3
             for i in range(0, len(image_files), cols_per_row):
                 cols = st.columns(cols_per_row)
@@ -259,8 +273,7 @@ def main():
                     idx = i + j
                     if idx < len(image_files):
                         with col:
-                            img_file = image_files[idx]
-                            st.image(str(img_file), use_container_width=True, caption=f"Image {idx + 1}")
+                            st.image(thumbnails[idx], use_container_width=True, caption=f"Image {idx + 1}")
 
             st.markdown("---")
 
@@ -269,7 +282,7 @@ def main():
             show_process_log("images_gen_log", "📋 Image Creation Log")
 
             # Approval Section
-            is_approved = get_approval_status(project_name, "images")
+            is_approved = stages_status["images"]["approved"]
 
             st.markdown("## ✅ Approval")
 
@@ -1,6 +1,7 @@
 """
 Video Page - Compose final video and download
 """
+import os
 import sys
 from pathlib import Path
 
@@ -14,12 +15,17 @@ from pathlib import Path
 from app.components.sidebar import render_sidebar
 from app.state import (
     get_project_path,
-    stage_file_exists,
-    get_approval_status,
+    get_all_stages_status,
     set_approval
 )
-from app.utils import capture_stdout_to_streamlit, show_process_log
-from src.video_composition import compose_video
+from app.utils import (
+    show_process_log,
+    read_process_log,
+    start_background_job,
+    get_background_job,
+    read_media_cached,
+    require_project
+)
 
 
 # Page config
@@ -33,15 +39,45 @@ st.set_page_config(
 render_sidebar()
 
 
-def main():
+@st.fragment(run_every=2)
+def _render_video_job_progress():
+    """
+    Progress of a running composition job. Polls every 2 seconds on its own,
+    then reruns the whole page once the job has finished.
+    """
+    job = get_background_job("video_gen_log")
+    if job is None or job["done"]:
+        st.rerun()
+
+    st.info("⏳ Composing video in the background... This may take 10-15 minutes. "
+            "You can leave this page and come back.")
+    log_text = read_process_log("video_gen_log")
+    if log_text:
+        st.code(log_text, language=None)
+
+
+def _compose_video_job(images_dir: str, audio_file: str, video_file: str) -> str:
+    """
+    Background job body: compose the final video. It's rendered to a temporary
+    file and moved into place only once complete, so a failed run never leaves
+    a partial MP4 where the page (or a restarted server) would show it.
+    """
+    # Imported here so reruns don't pay for loading MoviePy
+    from src.video_composition import compose_video
+
+    partial_file = str(Path(video_file).with_suffix(".partial.mp4"))
+    try:
+        compose_video(images_dir, audio_file, partial_file)
+        os.replace(partial_file, video_file)
+    finally:
+        if os.path.exists(partial_file):
+            os.remove(partial_file)
+    return video_file
+
+
+@require_project
+def main(project_name):
     """Video page main content."""
-
-    # Check if project is selected
-    if not st.session_state.get("current_project"):
-        st.warning("👈 Please select or create a project first")
-        return
-
-    project_name = st.session_state.current_project
     project_path = get_project_path(project_name)
     audio_file = project_path / "2_audio.mp3"
     images_dir = project_path / "5_images"
@@ -52,11 +88,12 @@ def main():
     st.markdown(f"**Project:** {project_name}")
     st.markdown("---")
 
-    # Check prerequisites
-    audio_exists = stage_file_exists(project_name, "audio")
-    audio_approved = get_approval_status(project_name, "audio")
-    images_exist = stage_file_exists(project_name, "images")
-    images_approved = get_approval_status(project_name, "images")
+    # Check prerequisites (one cached status lookup covers every stage)
+    stages_status = get_all_stages_status(project_name)
+    audio_exists = stages_status["audio"]["exists"]
+    audio_approved = stages_status["audio"]["approved"]
+    images_exist = stages_status["images"]["exists"]
+    images_approved = stages_status["images"]["approved"]
 
     # Prerequisites check
     if not audio_exists or not audio_approved:
@@ -72,7 +109,23 @@ def main():
     # Video Composition Section
     st.markdown("## 🎬 Video Composition")
 
-    video_exists = stage_file_exists(project_name, "video")
+    # Composition runs on a background thread; while it does, only show its progress
+    video_job = get_background_job("video_gen_log")
+    if video_job is not None and not video_job["done"]:
+        _render_video_job_progress()
+        return
+
+    # Outcome of the last composition job (if one ran since the server started)
+    job_failed = video_job is not None and not video_job["succeeded"]
+    if job_failed:
+        st.error(f"❌ Error composing video: {video_job['error']}")
+        show_process_log("video_gen_log", "📋 Video Composition Log")
+    elif video_job is not None and not video_job.get("reported"):
+        st.success("✅ Video composed!")
+        video_job["reported"] = True
+
+    # After a failed job the video isn't offered, only another composition
+    video_exists = stages_status["video"]["exists"] and not job_failed
 
     if not video_exists:
         st.info("💡 Compose the final video by combining audio narration and AI-generated images")
@@ -80,23 +133,14 @@ def main():
         st.warning("⚠️ **Note:** Video composition can take 10-15 minutes for longer videos")
 
         if st.button("🎬 Compose Video", key="compose_video_btn", type="primary", use_container_width=True):
-            log_container = st.empty()
-            with st.spinner("Composing video... This may take 10-15 minutes..."):
-                try:
-                    with capture_stdout_to_streamlit(log_container, session_key="video_gen_log"):
-                        compose_video(
-                            str(images_dir),
-                            str(audio_file),
-                            str(video_file)
-                        )
-
-                    st.success("✅ Video composed successfully!")
-                    st.balloons()
-                    st.rerun()
-
-                except Exception as e:
-                    st.error(f"❌ Error composing video: {str(e)}")
-                    st.exception(e)
+            start_background_job(
+                "video_gen_log",
+                _compose_video_job,
+                str(images_dir),
+                str(audio_file),
+                str(video_file)
+            )
+            st.rerun()
 
     else:
         # Display Video
@@ -111,7 +155,7 @@ def main():
         with col2:
             st.metric("Format", "MP4")
         with col3:
-            is_approved = get_approval_status(project_name, "video")
+            is_approved = stages_status["video"]["approved"]
             if is_approved:
                 st.success("✅ Approved")
             else:
@@ -119,9 +163,10 @@ def main():
 
         st.markdown("---")
 
-        # Video Player
-        with open(video_file, 'rb') as f:
-            st.video(f.read())
+        # Video Player and download share one read of the file per version,
+        # instead of reading the whole MP4 again on every rerun
+        video_bytes = read_media_cached(video_file)
+        st.video(video_bytes)
 
         st.markdown("---")
 
@@ -132,35 +177,24 @@ def main():
             st.markdown("### 🔄 Regenerate")
 
             if st.button("🔄 Regenerate Video", key="regen_video_btn", use_container_width=True):
-                log_container = st.empty()
-                with st.spinner("Regenerating video... This may take 10-15 minutes..."):
-                    try:
-                        with capture_stdout_to_streamlit(log_container, session_key="video_gen_log"):
-                            compose_video(
-                                str(images_dir),
-                                str(audio_file),
-                                str(video_file)
-                            )
-
-                        # Reset approval
-                        set_approval(project_name, "video", False)
-
-                        st.success("✅ Video regenerated!")
-                        st.rerun()
-
-                    except Exception as e:
-                        st.error(f"❌ Error: {str(e)}")
+                # Reset approval up front; the old video is replaced by the job
+                set_approval(project_name, "video", False)
+                start_background_job(
+                    "video_gen_log",
+                    _compose_video_job,
+                    str(images_dir),
+                    str(audio_file),
+                    str(video_file)
+                )
+                st.rerun()
 
         with col2:
             st.markdown("### 💾 Download")
 
             # Download button
-            with open(video_file, 'rb') as f:
-                video_bytes_dl = f.read()
-
             st.download_button(
                 label="⬇️ Download Video",
-                data=video_bytes_dl,
+                data=video_bytes,
                 file_name=f"{project_name}_final.mp4",
                 mime="video/mp4",
                 use_container_width=True
@@ -3,13 +3,31 @@ Simple state management for project approvals.
 Reads/writes projects/{name}/config.json for approval tracking.
 """
 import json
+import os
 from pathlib import Path
 from typing import Dict, Any, Optional
 
+import streamlit as st
+
+
+# Map stages to their output files
+STAGE_FILES = {
+    "script": "1_summary.txt",
+    "audio": "2_audio.mp3",
+    "metadata": "4_metadata.json",
+    "images": "5_images",  # Directory
+    "video": "6_final_video.mp4"
+}
+
+
+# Resolved once at import; every project path below is derived from it, so
+# reruns don't pay for a realpath() walk on each get_project_path() call
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
 
 def get_project_root() -> Path:
     """Get the project root directory."""
-    return Path(__file__).resolve().parent.parent
+    return _PROJECT_ROOT
 
 
 def get_project_path(project_name: str) -> Path:
@@ -27,12 +45,42 @@ def project_exists(project_name: str) -> bool:
     return get_project_path(project_name).exists()
 
 
+def _mtime_ns(path: Path) -> int:
+    """Get a path's modification time in nanoseconds (0 if it doesn't exist)."""
+    try:
+        return path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return 0
+
+
+def file_version(path) -> Optional[tuple]:
+    """
+    Get a file's (mtime, size), or None if it doesn't exist. Used as a cache
+    key so cached reads are reused across reruns until the file is rewritten;
+    the size tells apart two writes that land within the same mtime tick.
+    """
+    try:
+        stat = Path(path).stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
 def list_projects() -> list[str]:
     """List all project names."""
     projects_dir = get_project_root() / "projects"
-    if not projects_dir.exists():
+    # Creating or deleting a project directory bumps the parent's mtime,
+    # so the cached listing is reused until the set of projects changes
+    return _list_projects_cached(str(projects_dir), _mtime_ns(projects_dir))
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _list_projects_cached(projects_dir: str, dir_mtime_ns: int) -> list[str]:
+    """List project directories (cached per directory mtime)."""
+    projects_path = Path(projects_dir)
+    if not projects_path.exists():
         return []
-    return sorted([p.name for p in projects_dir.iterdir() if p.is_dir()])
+    return sorted([p.name for p in projects_path.iterdir() if p.is_dir()])
 
 
 def create_project(project_name: str) -> None:
@@ -53,15 +101,15 @@ def create_project(project_name: str) -> None:
     }
 
     config_path = get_project_config_path(project_name)
-    with open(config_path, 'w', encoding='utf-8') as f:
-        json.dump(default_config, f, indent=2)
+    config_path.write_text(json.dumps(default_config, indent=2), encoding='utf-8')
 
 
 def load_project_config(project_name: str) -> Dict[str, Any]:
     """Load a project's config.json."""
     config_path = get_project_config_path(project_name)
+    version = file_version(config_path)
 
-    if not config_path.exists():
+    if version is None:
         # Return default if config doesn't exist
         return {
             "project_name": project_name,
@@ -74,8 +122,15 @@ def load_project_config(project_name: str) -> Dict[str, Any]:
             }
         }
 
-    with open(config_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    # Parsed once per write; set_approval() etc. get a fresh copy to modify
+    return _load_project_config_cached(str(config_path), version)
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _load_project_config_cached(config_path: str, version: tuple) -> Dict[str, Any]:
+    """Load a project's config.json (cached per file version)."""
+    # One read of the whole (small) file, then parse from memory
+    return json.loads(Path(config_path).read_text(encoding='utf-8'))
 
 
 def save_project_config(project_name: str, config: Dict[str, Any]) -> None:
@@ -83,8 +138,8 @@ def save_project_config(project_name: str, config: Dict[str, Any]) -> None:
     config_path = get_project_config_path(project_name)
     config_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(config_path, 'w', encoding='utf-8') as f:
-        json.dump(config, f, indent=2)
+    # Serialize first, then write the file in one call
+    config_path.write_text(json.dumps(config, indent=2), encoding='utf-8')
 
 
 def get_approval_status(project_name: str, stage: str) -> bool:
@@ -99,6 +154,10 @@ def set_approval(project_name: str, stage: str, approved: bool) -> None:
 
     if "approvals" not in config:
         config["approvals"] = {}
+    elif config["approvals"].get(stage) == approved:
+        # Nothing to change; skipping the write also keeps config.json's
+        # version, so cached config and stage status stay valid
+        return
 
     config["approvals"][stage] = approved
     save_project_config(project_name, config)
@@ -108,23 +167,14 @@ def stage_file_exists(project_name: str, stage: str) -> bool:
     """Check if a stage's output file exists."""
     project_path = get_project_path(project_name)
 
-    # Map stages to their output files
-    stage_files = {
-        "script": "1_summary.txt",
-        "audio": "2_audio.mp3",
-        "metadata": "4_metadata.json",
-        "images": "5_images",  # Directory
-        "video": "6_final_video.mp4"
-    }
-
-    if stage not in stage_files:
+    if stage not in STAGE_FILES:
         return False
 
-    file_path = project_path / stage_files[stage]
+    file_path = project_path / STAGE_FILES[stage]
 
     # For images, check if directory exists and has files
     if stage == "images":
-        return file_path.exists() and any(file_path.iterdir())
+        return file_path.is_dir() and _dir_has_entries(str(file_path))
 
     return file_path.exists()
 
@@ -139,5 +189,46 @@ def get_stage_status(project_name: str, stage: str) -> Dict[str, Any]:
 
 def get_all_stages_status(project_name: str) -> Dict[str, Dict[str, Any]]:
     """Get status of all stages."""
-    stages = ["script", "audio", "metadata", "images", "video"]
-    return {stage: get_stage_status(project_name, stage) for stage in stages}
+    project_path = get_project_path(project_name)
+    # Stage outputs appearing/disappearing bump the project (or images) directory
+    # mtime, and approvals live in config.json, so together these identify the
+    # current status without re-reading config.json once per stage on every rerun
+    fingerprint = (
+        _mtime_ns(project_path),
+        file_version(project_path / "config.json"),
+        _mtime_ns(project_path / "5_images"),
+    )
+    return _all_stages_status_cached(project_name, fingerprint)
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _all_stages_status_cached(project_name: str, fingerprint: tuple) -> Dict[str, Dict[str, Any]]:
+    """Get status of all stages (cached per project fingerprint)."""
+    project_path = get_project_path(project_name)
+
+    # One directory read covers every stage, instead of a stat per stage
+    try:
+        with os.scandir(project_path) as it:
+            entries = {entry.name: entry for entry in it}
+    except FileNotFoundError:
+        entries = {}
+
+    # One config read covers every approval
+    approvals = load_project_config(project_name).get("approvals", {})
+
+    status = {}
+    for stage, filename in STAGE_FILES.items():
+        entry = entries.get(filename)
+        if stage == "images":
+            # For images, check if directory exists and has files
+            exists = entry is not None and entry.is_dir() and _dir_has_entries(entry.path)
+        else:
+            exists = entry is not None
+        status[stage] = {"exists": exists, "approved": approvals.get(stage, False)}
+    return status
+
+
+def _dir_has_entries(path: str) -> bool:
+    """Check if a directory contains anything, reading at most one entry."""
+    with os.scandir(path) as it:
+        return next(it, None) is not None
@@ -2,17 +2,110 @@
 Utility helpers for the Streamlit app.
 """
 import io
+import os
+import re
+import html
+import json
 import sys
+import time
+import threading
 import contextlib
+import contextvars
+import functools
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 import streamlit as st
 
+from app.state import get_project_path, file_version
+
+# Live log output is redrawn at most every 100ms, or sooner once 4KB of new text is waiting
+LOG_FLUSH_INTERVAL_SECONDS = 0.1
+LOG_FLUSH_CHARS = 4096
+# Only the most recent lines are shown live; the full log is written to disk
+LOG_DISPLAY_LINES = 2000
+# Process logs are written through a 64KB buffer and shown from their last 64KB
+PROCESS_LOG_BUFFER_BYTES = 64 * 1024
+PROCESS_LOG_TAIL_BYTES = 64 * 1024
+
+# Gallery previews are downscaled to fit this box before being sent to the browser
+THUMBNAIL_MAX_SIZE = (640, 640)
+
+# Text files are scanned in 1M-character chunks when only stats are needed
+READ_CHUNK_CHARS = 1 << 20
+
+# 11-character video ID in youtube.com/watch?...v=<id> and youtu.be/<id> links
+_YOUTUBE_VIDEO_ID_RE = re.compile(r'(?:youtube\.com/watch\?(?:[^#]*&)?v=|youtu\.be/)([A-Za-z0-9_-]{11})')
+
+
+class _RoutedStdout:
+    """
+    sys.stdout stand-in that sends print() output to the target set with
+    _redirect_stdout for the current context, or to the original stdout.
+    The target lives in a context variable, so a background job and a page's
+    live log capture can run at the same time without picking up each other's
+    output, and pipeline code that runs pool work in a copy of its context
+    (contextvars.copy_context().run) keeps printing to the same target.
+    Writes are serialized, since pool threads may share one target.
+    """
+    def __init__(self, default):
+        self._default = default
+        self._lock = threading.RLock()
+
+    def _target(self):
+        return _STDOUT_TARGET.get() or self._default
+
+    def write(self, text):
+        target = self._target()
+        with self._lock:
+            return target.write(text)
+
+    def flush(self):
+        target = self._target()
+        with self._lock:
+            target.flush()
+
+    def __getattr__(self, name):
+        return getattr(self._target(), name)
+
+
+_STDOUT_TARGET = contextvars.ContextVar("stdout_target", default=None)
+_STDOUT_ROUTER_LOCK = threading.Lock()
+
+
+@contextlib.contextmanager
+def _redirect_stdout(target):
+    """Send print() output from the current context to target for the duration of the block."""
+    with _STDOUT_ROUTER_LOCK:
+        if not isinstance(sys.stdout, _RoutedStdout):
+            sys.stdout = _RoutedStdout(sys.stdout)
+    token = _STDOUT_TARGET.set(target)
+    try:
+        yield
+    finally:
+        _STDOUT_TARGET.reset(token)
+
+
+def _process_log_path(session_key):
+    """
+    Path of the on-disk process log for session_key in the current project
+    (projects/<name>/logs/<session_key>.log), or None if no project is selected.
+    """
+    project_name = st.session_state.get("current_project")
+    if not project_name:
+        return None
+    return get_project_path(project_name) / "logs" / f"{session_key}.log"
+
 
 @contextlib.contextmanager
 def capture_stdout_to_streamlit(container, session_key=None):
     """
     Context manager that captures print() output from pipeline functions
-    and displays each line in a Streamlit container in real-time.
-    Optionally stores the captured log in st.session_state[session_key].
+    and displays it in a Streamlit container as it arrives (redrawn in small
+    batches, showing the latest LOG_DISPLAY_LINES lines).
+    With a session_key, the full log is also written to the project's
+    logs/<session_key>.log for show_process_log() (or kept in
+    st.session_state[session_key] when no project is selected).
 
     Usage:
         log_container = st.empty()
@@ -20,39 +113,330 @@ def capture_stdout_to_streamlit(container, session_key=None):
             some_pipeline_function(...)
     """
     class StreamlitWriter(io.TextIOBase):
-        def __init__(self, container):
+        def __init__(self, container, log_file=None):
             self._container = container
-            self._lines = []
+            self._log_file = log_file
+            self._lines = [] if log_file is None else None
+            self._tail = deque(maxlen=LOG_DISPLAY_LINES)
+            self._pending_chars = 0
+            self._last_flush = 0.0
+            # Only the thread running the page may draw; lines printed by
+            # pool threads are shown with the next redraw from this one
+            self._owner_thread = threading.get_ident()
 
         def write(self, text):
             if text and text.strip():
-                self._lines.append(text.strip())
-                # Show all accumulated lines as a code block
-                self._container.code("\n".join(self._lines), language=None)
+                line = text.strip()
+                if self._log_file is not None:
+                    self._log_file.write(line + "\n")
+                else:
+                    self._lines.append(line)
+                self._tail.append(line)
+                self._pending_chars += len(line)
+                # Redraw in batches rather than once per print()
+                if threading.get_ident() == self._owner_thread and (
+                        self._pending_chars >= LOG_FLUSH_CHARS
+                        or time.monotonic() - self._last_flush >= LOG_FLUSH_INTERVAL_SECONDS):
+                    self.flush()
             return len(text) if text else 0
 
         def flush(self):
-            pass
+            if self._pending_chars:
+                # Show the most recent lines as a code block
+                self._container.code("\n".join(self._tail), language=None)
+                self._pending_chars = 0
+                self._last_flush = time.monotonic()
 
         def get_log(self):
             return "\n".join(self._lines)
 
-    writer = StreamlitWriter(container)
-    old_stdout = sys.stdout
-    sys.stdout = writer
+    log_path = _process_log_path(session_key) if session_key else None
+    log_file = None
+    if log_path is not None:
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        # Each run replaces the previous log for this step
+        log_file = open(log_path, 'w', encoding='utf-8', buffering=PROCESS_LOG_BUFFER_BYTES)
+
+    writer = StreamlitWriter(container, log_file)
     try:
-        yield writer
+        with _redirect_stdout(writer):
+            yield writer
     finally:
-        sys.stdout = old_stdout
-        if session_key and writer._lines:
+        # Draw whatever arrived since the last batch
+        writer.flush()
+        if log_file is not None:
+            log_file.close()
+        elif session_key and writer._lines:
             st.session_state[session_key] = writer.get_log()
 
 
+def require_project(page_main):
+    """
+    Decorator for a page's main(): shows the "select a project" warning and
+    returns early when no project is selected, otherwise calls
+    page_main(project_name).
+    """
+    @functools.wraps(page_main)
+    def wrapper():
+        project_name = st.session_state.get("current_project")
+        if not project_name:
+            st.warning("👈 Please select or create a project first")
+            return
+        return page_main(project_name)
+    return wrapper
+
+
+# Background jobs by log path. Module-level rather than in session state so a
+# job is still found (and not started twice) after the page is reloaded.
+_BACKGROUND_JOBS = {}
+_BACKGROUND_JOBS_LOCK = threading.Lock()
+
+
+def start_background_job(session_key, target, *args):
+    """
+    Run target(*args) on a daemon thread so the page stays responsive during
+    long pipeline steps. The job's print() output (including output from pool
+    threads that run in a copy of its context) goes to the project's
+    logs/<session_key>.log, readable with read_process_log(). Returns the job
+    dict ({"done": bool, "succeeded": bool, "result": target's return value,
+    "error": str or None}); a job that is already running for this key is
+    returned instead of starting another.
+    """
+    log_path = _process_log_path(session_key)
+    with _BACKGROUND_JOBS_LOCK:
+        job = _BACKGROUND_JOBS.get(str(log_path))
+        if job is not None and not job["done"]:
+            return job
+        job = {"done": False, "succeeded": False, "result": None, "error": None}
+        _BACKGROUND_JOBS[str(log_path)] = job
+
+    def run():
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(log_path, 'w', encoding='utf-8', buffering=1) as log_file, \
+                _redirect_stdout(log_file):
+            try:
+                job["result"] = target(*args)
+                job["succeeded"] = True
+            except Exception as e:
+                job["error"] = str(e) or type(e).__name__
+                print(f"❌ Error: {e}")
+        job["done"] = True
+
+    threading.Thread(target=run, name=f"job-{session_key}", daemon=True).start()
+    return job
+
+
+def get_background_job(session_key):
+    """Get the current project's job for session_key (see start_background_job), or None."""
+    with _BACKGROUND_JOBS_LOCK:
+        return _BACKGROUND_JOBS.get(str(_process_log_path(session_key)))
+
+
+def read_process_log(session_key) -> str:
+    """
+    Get the stored process log for session_key: the last PROCESS_LOG_TAIL_BYTES
+    of the project's log file, or the session-state copy if no project is selected.
+    """
+    log_path = _process_log_path(session_key)
+    if log_path is not None and log_path.exists():
+        return _read_log_tail_cached(str(log_path), file_version(log_path))
+    return st.session_state.get(session_key)
+
+
 def show_process_log(session_key, label="📋 Process Log"):
     """
-    Display a stored process log in a collapsible expander.
+    Display a stored process log in a collapsible expander (read from the
+    project's log file, so it survives reloads).
     Call this on every page that runs a pipeline function.
     """
-    if session_key in st.session_state and st.session_state[session_key]:
+    log_text = read_process_log(session_key)
+    if log_text:
         with st.expander(label, expanded=False):
-            st.code(st.session_state[session_key], language=None)
+            st.code(log_text, language=None)
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _read_log_tail_cached(path: str, version: tuple) -> str:
+    """Read the last PROCESS_LOG_TAIL_BYTES of a log file (cached per file version)."""
+    with open(path, 'rb') as f:
+        size = f.seek(0, os.SEEK_END)
+        f.seek(max(0, size - PROCESS_LOG_TAIL_BYTES))
+        tail = f.read()
+    if size > PROCESS_LOG_TAIL_BYTES:
+        # Drop the line cut off at the start of the window
+        tail = tail.split(b"\n", 1)[-1]
+    return tail.decode('utf-8', errors='replace').rstrip("\n")
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _count_words_cached(path: str, version: tuple) -> int:
+    """Count words in a text file chunk by chunk (cached per file version)."""
+    word_count = 0
+    carry = ""
+    with open(path, 'r', encoding='utf-8') as f:
+        for chunk in iter(lambda: f.read(READ_CHUNK_CHARS), ""):
+            words = (carry + chunk).split()
+            # A word cut off at the chunk boundary continues in the next chunk
+            carry = words.pop() if words and not chunk[-1].isspace() else ""
+            word_count += len(words)
+    return word_count + (1 if carry else 0)
+
+
+def count_words(path) -> int:
+    """
+    Count whitespace-separated words in a text file without loading it all
+    into memory. Cached until the file changes.
+    """
+    return _count_words_cached(str(path), file_version(path))
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _read_text_cached(path: str, version: tuple) -> str:
+    """Read a UTF-8 text file (cached per file version)."""
+    return Path(path).read_text(encoding='utf-8')
+
+
+def read_text_cached(path) -> str:
+    """
+    Read a UTF-8 text file, reusing the previous read on reruns until the
+    file changes.
+    """
+    return _read_text_cached(str(path), file_version(path))
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _read_bytes_cached(path: str, version: tuple) -> bytes:
+    """Read a binary file (cached per file version; few entries since media files are large)."""
+    return Path(path).read_bytes()
+
+
+def read_bytes_cached(path) -> bytes:
+    """
+    Read a binary file (e.g. an image for a download button), reusing the
+    previous read on reruns until the file changes.
+    """
+    return _read_bytes_cached(str(path), file_version(path))
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _read_media_cached(path: str, version: tuple) -> bytes:
+    """
+    Read an audio/video file (cached per file version). A resource cache hands
+    back the same immutable bytes object instead of a per-rerun copy, and one
+    entry keeps at most one large media file in memory.
+    """
+    return Path(path).read_bytes()
+
+
+def read_media_cached(path) -> bytes:
+    """
+    Read a media file for st.audio/st.video or a download button. Given a path,
+    those widgets read the whole file again on every rerun; the bytes read here
+    are reused until the file changes.
+    """
+    return _read_media_cached(str(path), file_version(path))
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _list_files_cached(directory: str, suffix: str, dir_mtime_ns: int) -> list:
+    """List files with a suffix in a directory, sorted by name (cached per directory mtime)."""
+    with os.scandir(directory) as it:
+        return sorted(entry.name for entry in it if entry.name.endswith(suffix) and entry.is_file())
+
+
+def list_files(directory, suffix: str) -> list:
+    """
+    Sorted paths of the files in a directory ending with suffix (e.g. ".png"),
+    or [] if the directory doesn't exist. Adding or removing a file bumps the
+    directory's mtime, so the listing is reused across reruns until then.
+    """
+    directory = Path(directory)
+    try:
+        dir_mtime_ns = directory.stat().st_mtime_ns
+    except FileNotFoundError:
+        return []
+    return [directory / name for name in _list_files_cached(str(directory), suffix, dir_mtime_ns)]
+
+
+def _make_thumbnail(path: str) -> bytes:
+    """Downscale an image to fit THUMBNAIL_MAX_SIZE and encode it as JPEG."""
+    # Imported here so pages without a gallery don't load Pillow
+    from PIL import Image
+
+    with Image.open(path) as img:
+        img.thumbnail(THUMBNAIL_MAX_SIZE, Image.Resampling.LANCZOS)
+        buffer = io.BytesIO()
+        img.convert("RGB").save(buffer, format="JPEG", quality=85)
+    return buffer.getvalue()
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _image_thumbnails_cached(paths: tuple, versions: tuple) -> list:
+    """Build JPEG thumbnails for a set of images in parallel (cached per file versions)."""
+    # Pillow releases the GIL while decoding, resizing and encoding, so threads
+    # spread the work across cores without pickling images between processes
+    with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as executor:
+        return list(executor.map(_make_thumbnail, paths))
+
+
+def image_thumbnails(paths) -> list:
+    """
+    Get small JPEG previews of images for gallery display, so reruns send a
+    few tens of KB per image instead of the full-resolution PNG. Built once per
+    set of image versions and kept in memory; nothing is written next to the
+    originals.
+    """
+    paths = tuple(str(p) for p in paths)
+    return _image_thumbnails_cached(paths, tuple(file_version(p) for p in paths))
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _read_json_cached(path: str, version: tuple):
+    """Read and parse a UTF-8 JSON file (cached per file version)."""
+    return json.loads(Path(path).read_text(encoding='utf-8'))
+
+
+def read_json_cached(path):
+    """
+    Read and parse a UTF-8 JSON file, reusing the parsed value on reruns until
+    the file changes. Each call returns a fresh copy, so callers may mutate it.
+    Raises json.JSONDecodeError if the file isn't valid JSON.
+    """
+    return _read_json_cached(str(path), file_version(path))
+
+
+def write_json_atomic(path, data) -> None:
+    """
+    Write data as UTF-8 JSON via a temp file and rename, so a crash mid-write
+    never leaves a truncated file behind for the cached readers to pick up.
+    """
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding='utf-8')
+    os.replace(tmp_path, path)
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _read_text_as_html_cached(path: str, version: tuple) -> str:
+    """Read a UTF-8 text file as escaped HTML with <br> line breaks (cached per file version)."""
+    return html.escape(Path(path).read_text(encoding='utf-8')).replace('\n', '<br>')
+
+
+def read_text_as_html(path) -> str:
+    """
+    Read a UTF-8 text file for display inside an HTML block: markup in the
+    text is escaped and newlines are turned into <br>. The converted string is
+    reused on reruns until the file changes.
+    """
+    return _read_text_as_html_cached(str(path), file_version(path))
+
+
+def extract_video_id(url: str):
+    """Return the YouTube video ID from a watch or youtu.be URL, or None."""
+    match = _YOUTUBE_VIDEO_ID_RE.search(url or "")
+    return match.group(1) if match else None
+
+
+def is_youtube_url(url: str) -> bool:
+    """Check whether a URL is a YouTube video link we can transcribe."""
+    return extract_video_id(url) is not None
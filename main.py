@@ -1,4 +1,10 @@
 import os
+import argparse
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
 from src import transcription
 from src import summarization
 from src import text_to_speech
@@ -8,16 +14,37 @@ from src import image_creation
 from src import video_composition
 from src.logger import init_logging, stop_logging, get_log_path
 
+@dataclass(frozen=True)
+class Stage:
+    """A pipeline stage and the project file (or folder) it produces."""
+    id: int
+    name: str
+    output: str
+    prereq_id: Optional[int] = None  # Stage whose output must exist before this one can run
+    # Every stage whose output this one reads, so the full pipeline can run
+    # independent stages (e.g. Metadata alongside TTS -> Image Prompts) together
+    depends_on: tuple = ()
+    is_dir: bool = False  # Output is a folder, done once it has files
+
+    @property
+    def label(self):
+        """Output name as shown to the user (folders get a trailing slash)."""
+        return f"{self.output}/" if self.is_dir else self.output
+
+
 # Pipeline stage definitions
-PIPELINE_STAGES = [
-    {"id": 0, "name": "Transcription", "output": "0_transcript.txt", "prereq": None},
-    {"id": 1, "name": "Summarization", "output": "1_summary.txt", "prereq": "0_transcript.txt"},
-    {"id": 2, "name": "Text-to-Speech", "output": "2_audio.mp3", "prereq": "1_summary.txt"},
-    {"id": 3, "name": "Image Prompts", "output": "3_image_prompts.json", "prereq": "1_summary.txt"},
-    {"id": 4, "name": "Metadata", "output": "4_metadata.json", "prereq": "1_summary.txt"},
-    {"id": 5, "name": "Image Generation", "output": "5_images/", "prereq": "3_image_prompts.json"},
-    {"id": 6, "name": "Video Composition", "output": "6_final_video.mp4", "prereq": "2_audio.mp3"},
-]
+PIPELINE_STAGES = (
+    Stage(0, "Transcription", "0_transcript.txt"),
+    Stage(1, "Summarization", "1_summary.txt", prereq_id=0, depends_on=(0,)),
+    Stage(2, "Text-to-Speech", "2_audio.mp3", prereq_id=1, depends_on=(1,)),
+    Stage(3, "Image Prompts", "3_image_prompts.json", prereq_id=1, depends_on=(1, 2)),
+    Stage(4, "Metadata", "4_metadata.json", prereq_id=1, depends_on=(1,)),
+    Stage(5, "Image Generation", "5_images", prereq_id=3, depends_on=(3,), is_dir=True),
+    Stage(6, "Video Composition", "6_final_video.mp4", prereq_id=2, depends_on=(2, 5)),
+)
+
+# Stages are API-bound (LLM, TTS, Imagen), so the full pipeline runs ready ones in threads
+MAX_PARALLEL_STAGES = 4
 
 
 def setup_project_directories(project_name):
@@ -26,6 +53,9 @@ def setup_project_directories(project_name):
     
     if os.path.exists(base_path):
         print(f"Project '{project_name}' already exists. Using existing directory.")
+        # Projects created elsewhere (e.g. the web app) may not have it yet;
+        # creating it once here means no stage has to check again
+        os.makedirs(os.path.join(base_path, "5_images"), exist_ok=True)
         return base_path
 
     os.makedirs(os.path.join(base_path, "5_images"))
@@ -33,192 +63,300 @@ def setup_project_directories(project_name):
     return base_path
 
 
-def get_stage_status(project_path, output):
+@lru_cache(maxsize=None)
+def get_stage_paths(project_path):
+    """Get the output path of every stage, keyed by stage id (built once per project)."""
+    base_path = Path(project_path)
+    return {stage.id: base_path / stage.output for stage in PIPELINE_STAGES}
+
+
+def _dir_has_entries(path):
+    """Check if a directory contains anything, reading at most one entry."""
+    with os.scandir(path) as it:
+        return next(it, None) is not None
+
+
+def get_stage_status(project_path, stage):
     """Check if a stage output exists."""
-    path = os.path.join(project_path, output)
-    if output.endswith("/"):
+    path = os.path.join(project_path, stage.output)
+    if stage.is_dir:
         # Directory - check if exists and has files
-        return os.path.isdir(path) and len(os.listdir(path)) > 0
+        return os.path.isdir(path) and _dir_has_entries(path)
     else:
         return os.path.isfile(path) and os.path.getsize(path) > 0
 
 
+def get_all_stage_statuses(project_path):
+    """
+    Check every stage output with a single directory scan.
+    Returns {stage_id: exists}.
+    """
+    try:
+        with os.scandir(project_path) as it:
+            entries = {entry.name: entry for entry in it}
+    except FileNotFoundError:
+        entries = {}
+
+    statuses = {}
+    for stage in PIPELINE_STAGES:
+        entry = entries.get(stage.output)
+        if entry is None:
+            exists = False
+        elif stage.is_dir:
+            # Directory - check if exists and has files
+            exists = entry.is_dir() and _dir_has_entries(entry.path)
+        else:
+            exists = entry.is_file() and entry.stat().st_size > 0
+        statuses[stage.id] = exists
+    return statuses
+
+
 def print_pipeline_status(project_name, project_path):
     """Display current pipeline status with checkmarks."""
-    print(f"\n--- Pipeline Status ---")
-    print(f"Project: {project_name}")
-    print(f"Path: {os.path.abspath(project_path)}")
-    print("-" * 30)
+    lines = [
+        f"\n--- Pipeline Status ---",
+        f"Project: {project_name}",
+        f"Path: {os.path.abspath(project_path)}",
+        "-" * 30,
+    ]
     
+    statuses = get_all_stage_statuses(project_path)
     for stage in PIPELINE_STAGES:
-        exists = get_stage_status(project_path, stage["output"])
-        status = "✅" if exists else "❌"
-        print(f"  {stage['id']}. {stage['output']:<22} {status}")
-    print("-" * 30)
+        status = "✅" if statuses[stage.id] else "❌"
+        lines.append(f"  {stage.id}. {stage.label:<22} {status}")
+    lines.append("-" * 30)
+
+    # The whole table goes out (and into the log) in one write per redraw
+    print("\n".join(lines))
 
 
-def check_prerequisite(project_path, stage_id):
-    """Check if prerequisite for a stage exists. Returns (ok, message)."""
+def check_prerequisite(project_path, stage_id, statuses=None):
+    """
+    Check if prerequisite for a stage exists. Returns (ok, message).
+    If a status map from get_all_stage_statuses is given, it is used instead of the disk.
+    """
     stage = PIPELINE_STAGES[stage_id]
-    prereq = stage["prereq"]
-    
-    if prereq is None:
+    if stage.prereq_id is None:
         return True, None
     
-    prereq_path = os.path.join(project_path, prereq)
-    if prereq.endswith("/"):
-        exists = os.path.isdir(prereq_path) and len(os.listdir(prereq_path)) > 0
+    prereq = PIPELINE_STAGES[stage.prereq_id]
+    if statuses is not None:
+        exists = statuses[prereq.id]
     else:
-        exists = os.path.isfile(prereq_path) and os.path.getsize(prereq_path) > 0
-    
+        exists = get_stage_status(project_path, prereq)
     if not exists:
-        return False, f"Missing prerequisite: {prereq}"
+        return False, f"Missing prerequisite: {prereq.label}"
     return True, None
 
 
-def confirm_overwrite(project_path, output):
-    """Ask user to confirm overwrite if output exists."""
-    if not get_stage_status(project_path, output):
-        return True  # Doesn't exist, proceed
-    
-    print(f"\n⚠️  Output already exists: {output}")
-    choice = input("Overwrite? (y/n): ").strip().lower()
-    return choice == 'y'
-
-
-def run_stage(project_path, stage_id):
-    """Run a specific pipeline stage. Returns True on success."""
+@dataclass
+class RunContext:
+    """
+    How a run answers the questions a stage would otherwise ask the user.
+    With interactive=False nothing ever calls input(), so stages can run
+    headless or on worker threads alongside each other.
+    """
+    overwrite: str = "ask"  # "ask", "skip" or "force" when an output already exists
+    youtube_url: Optional[str] = None  # Used by Transcription instead of prompting
+    interactive: bool = True
+
+    def should_overwrite(self, project_path, stage):
+        """Decide whether to (re)run a stage whose output may already exist."""
+        if not get_stage_status(project_path, stage):
+            return True  # Doesn't exist, proceed
+        if self.overwrite == "force":
+            return True
+        if self.overwrite == "skip" or not self.interactive:
+            return False
+        
+        print(f"\n⚠️  Output already exists: {stage.label}")
+        choice = input("Overwrite? (y/n): ").strip().lower()
+        return choice == 'y'
+
+    def get_youtube_url(self):
+        """The URL to transcribe, asking for it only in interactive runs."""
+        if self.youtube_url:
+            return self.youtube_url
+        if not self.interactive:
+            return ""
+        return input("Enter the YouTube URL to transcribe: ").strip()
+
+
+def run_stage(project_path, stage_id, ctx=None, statuses=None):
+    """
+    Run a specific pipeline stage. Returns True on success.
+
+    ctx is the RunContext (defaults to an interactive one that asks before
+    overwriting). statuses is an optional status map (see get_all_stage_statuses)
+    that the caller keeps current, so prerequisite checks don't go back to the disk.
+    """
+    ctx = ctx or RunContext()
     stage = PIPELINE_STAGES[stage_id]
-    output = stage["output"]
     
     # Check prerequisite
-    ok, msg = check_prerequisite(project_path, stage_id)
+    ok, msg = check_prerequisite(project_path, stage_id, statuses)
     if not ok:
-        print(f"❌ Cannot run {stage['name']}: {msg}")
+        print(f"❌ Cannot run {stage.name}: {msg}")
         return False
     
     # Check overwrite
-    if not confirm_overwrite(project_path, output):
+    if not ctx.should_overwrite(project_path, stage):
         print("Skipped.")
         return True  # User chose to skip, not a failure
     
-    print(f"\n🚀 Running: {stage['name']}...")
+    print(f"\n🚀 Running: {stage.name}...")
+    paths = get_stage_paths(project_path)
     
     try:
         if stage_id == 0:
             # Transcription - needs YouTube URL
-            youtube_url = input("Enter the YouTube URL to transcribe: ").strip()
+            youtube_url = ctx.get_youtube_url()
             if not youtube_url:
-                print("❌ URL cannot be empty.")
+                print("❌ URL cannot be empty." if ctx.interactive else "❌ No YouTube URL given (use --url).")
                 return False
-            output_path = os.path.join(project_path, "0_transcript.txt")
-            transcription.transcribe_youtube_audio(youtube_url, output_path)
+            transcription.transcribe_youtube_audio(youtube_url, str(paths[0]))
             
         elif stage_id == 1:
             # Summarization
-            input_path = os.path.join(project_path, "0_transcript.txt")
-            output_path = os.path.join(project_path, "1_summary.txt")
-            summarization.summarize_transcript(input_path, output_path)
+            summarization.summarize_transcript(str(paths[0]), str(paths[1]))
             
         elif stage_id == 2:
             # Text-to-Speech
-            input_path = os.path.join(project_path, "1_summary.txt")
-            output_path = os.path.join(project_path, "2_audio.mp3")
-            text_to_speech.synthesize_speech(input_path, output_path)
+            text_to_speech.synthesize_speech(str(paths[1]), str(paths[2]))
             
         elif stage_id == 3:
             # Image Prompts
-            summary_path = os.path.join(project_path, "1_summary.txt")
-            audio_path = os.path.join(project_path, "2_audio.mp3")
-            output_path = os.path.join(project_path, "3_image_prompts.json")
             # Audio might not exist yet - check and handle
-            if not os.path.exists(audio_path):
+            audio_ready = statuses[2] if statuses is not None else paths[2].exists()
+            if not audio_ready:
                 print("⚠️  Audio file not found. Running TTS first...")
-                if not run_stage(project_path, 2):
+                if not run_stage(project_path, 2, ctx):
                     return False
-            image_prompting.generate_image_prompts(summary_path, audio_path, output_path)
+            image_prompting.generate_image_prompts(str(paths[1]), str(paths[2]), str(paths[3]))
             
         elif stage_id == 4:
             # Metadata
-            input_path = os.path.join(project_path, "1_summary.txt")
-            output_path = os.path.join(project_path, "4_metadata.json")
-            metadata_generation.generate_metadata(input_path, output_path)
+            metadata_generation.generate_metadata(str(paths[1]), str(paths[4]))
             
         elif stage_id == 5:
             # Image Generation
-            input_path = os.path.join(project_path, "3_image_prompts.json")
-            output_dir = os.path.join(project_path, "5_images")
-            os.makedirs(output_dir, exist_ok=True)
-            image_creation.create_images_from_prompts(input_path, output_dir)
+            image_creation.create_images_from_prompts(str(paths[3]), str(paths[5]))
             
         elif stage_id == 6:
             # Video Composition
-            audio_path = os.path.join(project_path, "2_audio.mp3")
-            images_dir = os.path.join(project_path, "5_images")
-            output_path = os.path.join(project_path, "6_final_video.mp4")
             # Check images exist
-            if not get_stage_status(project_path, "5_images/"):
+            images_ready = statuses[5] if statuses is not None else get_stage_status(project_path, PIPELINE_STAGES[5])
+            if not images_ready:
                 print("❌ No images found. Run image generation first.")
                 return False
-            video_composition.compose_video(images_dir, audio_path, output_path)
+            video_composition.compose_video(str(paths[5]), str(paths[2]), str(paths[6]))
         
-        print(f"✅ {stage['name']} complete!")
+        print(f"✅ {stage.name} complete!")
         return True
         
     except Exception as e:
-        print(f"❌ Error in {stage['name']}: {e}")
+        print(f"❌ Error in {stage.name}: {e}")
         return False
 
 
 def get_next_missing_stage(project_path):
     """Find the first stage with missing output. Returns stage_id or None."""
+    statuses = get_all_stage_statuses(project_path)
     for stage in PIPELINE_STAGES:
-        if not get_stage_status(project_path, stage["output"]):
-            return stage["id"]
+        if not statuses[stage.id]:
+            return stage.id
     return None
 
 
-def run_full_pipeline(project_path):
-    """Run all remaining stages from current point."""
+def run_full_pipeline(project_path, ctx=None):
+    """
+    Run all remaining stages from current point. Returns True if the pipeline finished.
+    With ctx.overwrite == "force" every stage is regenerated (the transcript only
+    if a URL was given).
+    """
+    ctx = ctx or RunContext()
+    force = ctx.overwrite == "force"
     print("\n🔄 Running full pipeline from current point...")
     
     # Determine starting point
-    start_stage = get_next_missing_stage(project_path)
+    start_stage = 0 if force else get_next_missing_stage(project_path)
     
     if start_stage is None:
         print("✅ All stages complete! Nothing to run.")
-        return
-    
-    # Special case: if starting from stage 0, need YouTube URL
-    # If starting from stage 1+, we can auto-run
+        return True
     
+    done = set()
+    pending = set()
+    statuses = get_all_stage_statuses(project_path)
     for stage in PIPELINE_STAGES:
-        if stage["id"] < start_stage:
-            continue  # Skip completed stages
-        
-        # Skip if output already exists
-        if get_stage_status(project_path, stage["output"]):
-            print(f"⏭️  Skipping {stage['name']} (already exists)")
-            continue
-        
-        if not run_stage(project_path, stage["id"]):
-            print(f"\n⚠️  Pipeline stopped at {stage['name']}")
-            return
+        rerun = force and (stage.id != 0 or ctx.youtube_url)
+        if stage.id < start_stage:
+            done.add(stage.id)  # Skip completed stages
+        elif statuses[stage.id] and not rerun:
+            print(f"⏭️  Skipping {stage.name} (already exists)")
+            done.add(stage.id)
+        else:
+            pending.add(stage.id)
+
+    # Special case: if starting from stage 0, need YouTube URL, so it runs
+    # here in the foreground; every later stage can auto-run
+    if 0 in pending:
+        pending.discard(0)
+        if not run_stage(project_path, 0, ctx, statuses):
+            print(f"\n⚠️  Pipeline stopped at {PIPELINE_STAGES[0].name}")
+            return False
+        done.add(0)
+        statuses[0] = True
+
+    # Worker stages never prompt, so they can't contend for input()
+    worker_ctx = replace(ctx, interactive=False)
+
+    # Run each stage as soon as the stages it depends on are done
+    failed = None
+    with ThreadPoolExecutor(max_workers=MAX_PARALLEL_STAGES) as executor:
+        running = {}
+        while True:
+            if failed is None:
+                ready = sorted(sid for sid in pending if set(PIPELINE_STAGES[sid].depends_on) <= done)
+                for sid in ready:
+                    pending.discard(sid)
+                    running[executor.submit(run_stage, project_path, sid, worker_ctx, statuses)] = sid
+            if not running:
+                break
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                sid = running.pop(future)
+                if future.result():
+                    done.add(sid)
+                    # Only the scheduling thread writes; workers just read their prerequisites
+                    statuses[sid] = True
+                elif failed is None:
+                    # Stop scheduling new stages; ones already running finish
+                    failed = sid
+
+    if failed is not None:
+        print(f"\n⚠️  Pipeline stopped at {PIPELINE_STAGES[failed].name}")
+        return False
     
     print("\n🎉 Pipeline complete! Final video ready.")
+    return True
 
 
-def pipeline_menu(project_name, project_path):
-    """Display pipeline menu and handle actions."""
+def pipeline_menu(project_name, project_path, ctx=None):
+    """Display pipeline menu and handle actions (ctx as for run_stage)."""
+    ctx = ctx or RunContext()
     while True:
         print_pipeline_status(project_name, project_path)
         
-        print("\nChoose action:")
-        print("1. Run next missing step")
-        print("2. Run full pipeline from current point")
-        print("3. Run specific step")
-        print("4. Show project folder path")
-        print("9. Back to main menu")
+        print(
+            "\nChoose action:\n"
+            "1. Run next missing step\n"
+            "2. Run full pipeline from current point\n"
+            "3. Run specific step\n"
+            "4. Show project folder path\n"
+            "9. Back to main menu"
+        )
         
         choice = input("Enter your choice: ").strip()
         
@@ -227,20 +365,20 @@ def pipeline_menu(project_name, project_path):
             if next_stage is None:
                 print("✅ All stages complete!")
             else:
-                run_stage(project_path, next_stage)
+                run_stage(project_path, next_stage, ctx)
                 
         elif choice == '2':
-            run_full_pipeline(project_path)
+            run_full_pipeline(project_path, ctx)
             
         elif choice == '3':
             print("\nAvailable stages:")
             for stage in PIPELINE_STAGES:
-                print(f"  {stage['id']}. {stage['name']}")
+                print(f"  {stage.id}. {stage.name}")
             stage_choice = input("Enter stage number (0-6): ").strip()
             try:
                 stage_id = int(stage_choice)
                 if 0 <= stage_id <= 6:
-                    run_stage(project_path, stage_id)
+                    run_stage(project_path, stage_id, ctx)
                 else:
                     print("Invalid stage number.")
             except ValueError:
@@ -260,9 +398,9 @@ def pipeline_menu(project_name, project_path):
             print("Invalid choice.")
 
 
-def handle_youtube_url(project_path):
-    """Handles the YouTube URL transcription workflow."""
-    youtube_url = input("Enter the YouTube URL to transcribe: ").strip()
+def handle_youtube_url(project_path, ctx):
+    """Handles the YouTube URL transcription workflow (uses ctx's URL if one was given)."""
+    youtube_url = ctx.get_youtube_url()
     if youtube_url:
         transcript_file_path = os.path.join(project_path, "0_transcript.txt")
         try:
@@ -299,34 +437,37 @@ def handle_ready_script(project_path):
         return False
 
 
-def main_menu(project_name, project_path):
-    """Displays the main menu and handles user choices."""
+def main_menu(project_name, project_path, ctx=None):
+    """Displays the main menu and handles user choices (ctx as for run_stage)."""
+    ctx = ctx or RunContext()
     while True:
-        print("\n" + "=" * 40)
-        print("--- Main Menu ---")
-        print(f"Project: {project_name}")
-        print("=" * 40)
-        print("\nChoose your input source:")
-        print("1. Transcribe from YouTube URL")
-        print("2. Scrape from Article URL (coming soon)")
-        print("3. Use a Ready-Made Script")
-        print("4. Go to Pipeline Menu")
-        print("9. Exit")
+        print(
+            "\n" + "=" * 40 + "\n"
+            "--- Main Menu ---\n"
+            f"Project: {project_name}\n"
+            + "=" * 40 + "\n"
+            "\nChoose your input source:\n"
+            "1. Transcribe from YouTube URL\n"
+            "2. Scrape from Article URL (coming soon)\n"
+            "3. Use a Ready-Made Script\n"
+            "4. Go to Pipeline Menu\n"
+            "9. Exit"
+        )
         
         choice = input("\nEnter your choice: ").strip()
 
         if choice == '1':
-            if handle_youtube_url(project_path):
+            if handle_youtube_url(project_path, ctx):
                 # After successful transcription, go to pipeline menu
-                pipeline_menu(project_name, project_path)
+                pipeline_menu(project_name, project_path, ctx)
         elif choice == '2':
             print("\n⏳ This feature will be implemented soon using crawl4ai.")
         elif choice == '3':
             if handle_ready_script(project_path):
                 # After script is ready, go to pipeline menu
-                pipeline_menu(project_name, project_path)
+                pipeline_menu(project_name, project_path, ctx)
         elif choice == '4':
-            pipeline_menu(project_name, project_path)
+            pipeline_menu(project_name, project_path, ctx)
         elif choice == '9':
             print("\n👋 Exiting. Goodbye!")
             break
@@ -334,17 +475,31 @@ def main_menu(project_name, project_path):
             print("Invalid choice, please try again.")
 
 
-def main():
-    """Main function to run the video generator application."""
+def parse_args(argv=None):
+    """Parse command-line options. With no options the interactive menus are used."""
+    parser = argparse.ArgumentParser(description="Bibo YouTube Video Generator")
+    parser.add_argument("--project", help="Project name (skips the name prompt)")
+    parser.add_argument("--url", help="YouTube URL to transcribe when the project has no transcript")
+    parser.add_argument("--full", action="store_true",
+                        help="Run the full pipeline without any prompts, then exit")
+    parser.add_argument("--force", action="store_true",
+                        help="Regenerate stages whose output already exists instead of asking (or skipping, with --full)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Main function to run the video generator application. Returns the exit code."""
+    args = parse_args(argv)
+
     print("\n" + "=" * 50)
     print("🎬 Bibo YouTube Video Generator")
     print("=" * 50)
     
-    project_name = input("\nEnter project name (e.g., 'MyNewVideo'): ").strip()
+    project_name = (args.project or input("\nEnter project name (e.g., 'MyNewVideo'): ")).strip()
     
     if not project_name:
         print("Project name cannot be empty. Exiting.")
-        return
+        return 1
 
     # Initialize logging
     log_path = init_logging(project_name)
@@ -352,11 +507,20 @@ def main():
 
     try:
         project_path = setup_project_directories(project_name)
-        main_menu(project_name, project_path)
+        # --url and --force apply to the menus as well as to --full
+        ctx = RunContext(
+            overwrite="force" if args.force else ("skip" if args.full else "ask"),
+            youtube_url=args.url,
+            interactive=not args.full,
+        )
+        if args.full:
+            return 0 if run_full_pipeline(project_path, ctx) else 1
+        main_menu(project_name, project_path, ctx)
+        return 0
     finally:
         stop_logging()
         print(f"\n📝 Log saved to: {log_path}")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    raise SystemExit(main())
\ No newline at end of file
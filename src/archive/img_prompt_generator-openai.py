@@ -5,8 +5,9 @@ from langchain.prompts import ChatPromptTemplate
 from langchain.schema.output_parser import StrOutputParser
 from langchain_openai import ChatOpenAI
 from dotenv import load_dotenv
+import hashlib
 import os
-import math
+import re
 
 # === Load .env ===
 load_dotenv()
@@ -16,9 +17,14 @@ load_dotenv()
 # Change this one value to adjust how many images are generated for the video.
 SECONDS_PER_IMAGE = 20 
 
+# How many chunk prompts are requested from the LLM at once (keeps within rate limits)
+MAX_CONCURRENT_PROMPTS = 8
+
 # === Paths and Model Setup ===
 SUMMARY_PATH = Path("text/summary.txt")
 PROMPT_OUTPUT_PATH = Path("stark_vision_tools/scene_sequence/output/scene_prompts.txt")
+# Generated prompts are cached per chunk, so a rerun after a failure only pays for what's missing
+PROMPT_CACHE_DIR = PROMPT_OUTPUT_PATH.parent / ".cache"
 AUDIO_FILE_PATH = "audio/output.mp3"
 # llm = ChatOpenAI(model="o1") 
 llm = ChatOpenAI(model="gpt-4.1", temperature=0.8) 
@@ -36,31 +42,96 @@ prompt_template = ChatPromptTemplate.from_messages([
     ("user", "Text Chunk: \"{text_chunk}\"")
 ])
 
-# === Helper Function to Split Summary ===
-def split_summary_into_chunks(summary: str, num_chunks: int) -> list[str]:
+# Built once and shared by every chunk
+chain = prompt_template | llm | StrOutputParser()
+
+# === Helper Functions to Split Summary ===
+WORD_RE = re.compile(r"\S+")
+
+def chunk_offsets(summary: str, num_chunks: int) -> list[tuple[int, int]]:
     """
-    Splits the summary text into a specified number of roughly equal chunks based on word count.
+    Finds (start, end) character offsets that split the summary into a specified
+    number of roughly equal chunks based on word count.
     This is the core of the audio-visual sync logic.
+    Chunk sizes differ by at most one word (the first chunks take the remainder),
+    so the last image isn't left with a sliver of text.
     """
-    words = summary.split()
-    total_words = len(words)
+    total_words = sum(1 for _ in WORD_RE.finditer(summary))
     if total_words == 0:
         return []
         
-    words_per_chunk = math.ceil(total_words / num_chunks)
+    base_size, remainder = divmod(total_words, num_chunks)
     
-    text_chunks = []
-    for i in range(0, total_words, words_per_chunk):
-        chunk = " ".join(words[i:i + words_per_chunk])
-        text_chunks.append(chunk)
-    return text_chunks
+    offsets = []
+    chunk_start = None
+    words_left = base_size + (1 if remainder else 0)
+    for match in WORD_RE.finditer(summary):
+        if chunk_start is None:
+            chunk_start = match.start()
+        words_left -= 1
+        if words_left == 0:
+            offsets.append((chunk_start, match.end()))
+            chunk_start = None
+            words_left = base_size + (1 if len(offsets) < remainder else 0)
+    return offsets
+
+def split_summary_into_chunks(summary: str, num_chunks: int) -> list[str]:
+    """Slices the summary into chunks (see chunk_offsets), keeping its original punctuation and line breaks."""
+    return [summary[start:end] for start, end in chunk_offsets(summary, num_chunks)]
 
 # === Function to Generate a Single Prompt ===
 def generate_prompt_for_chunk(text_chunk: str) -> str:
     """Invokes the LLM chain to generate one prompt for one text chunk."""
-    chain = prompt_template | llm | StrOutputParser()
     return chain.invoke({"text_chunk": text_chunk})
 
+# === Prompt Cache Helpers ===
+def _prompt_cache_path(text_chunk: str) -> Path:
+    """Cache file for a chunk, keyed on the chunk text, the prompt template and the model."""
+    key = hashlib.blake2b(digest_size=16)
+    for part in (repr(prompt_template.messages), llm.model_name, text_chunk):
+        key.update(part.encode("utf-8"))
+        key.update(b"\0")
+    return PROMPT_CACHE_DIR / f"{key.hexdigest()}.txt"
+
+def _read_cached_prompt(text_chunk: str):
+    """Returns the cached prompt for a chunk, or None if it hasn't been generated yet."""
+    try:
+        return _prompt_cache_path(text_chunk).read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return None
+
+def _write_cached_prompt(text_chunk: str, prompt: str) -> None:
+    """Caches a generated prompt (written to a temp file first, so a crash never leaves half a prompt)."""
+    cache_path = _prompt_cache_path(text_chunk)
+    tmp_path = cache_path.with_suffix(".tmp")
+    tmp_path.write_text(prompt, encoding="utf-8")
+    os.replace(tmp_path, cache_path)
+
+# === Function to Generate All Prompts Concurrently ===
+def generate_prompts_for_chunks(text_chunks: list[str]) -> list:
+    """
+    Generates one prompt per text chunk, running up to MAX_CONCURRENT_PROMPTS
+    LLM calls at once. Results come back in chunk order; a chunk that failed
+    has its exception in place of the prompt, so one failure doesn't lose the rest.
+    Chunks with a cached prompt from an earlier run aren't sent to the LLM again.
+    """
+    PROMPT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    results = [_read_cached_prompt(chunk) for chunk in text_chunks]
+    missing = [i for i, prompt in enumerate(results) if prompt is None]
+    if len(missing) < len(text_chunks):
+        print(f"  -> Reusing {len(text_chunks) - len(missing)} cached prompts")
+
+    generated = chain.batch(
+        [{"text_chunk": text_chunks[i]} for i in missing],
+        config={"max_concurrency": MAX_CONCURRENT_PROMPTS},
+        return_exceptions=True,
+    ) if missing else []
+    for i, prompt in zip(missing, generated):
+        if not isinstance(prompt, Exception):
+            _write_cached_prompt(text_chunks[i], prompt)
+        results[i] = prompt
+    return results
+
 
 # === Main Execution Block ===
 if __name__ == "__main__":
@@ -80,12 +151,22 @@ if __name__ == "__main__":
         all_prompts = []
         print(f"📜 Generating {num_images} prompts, one for each text chunk (this may take a moment)...")
 
-        # 3. Loop through each text chunk and generate a corresponding prompt
-        for i, chunk in enumerate(text_chunks):
-            print(f"  -> Processing chunk {i+1}/{len(text_chunks)}...")
-            prompt = generate_prompt_for_chunk(chunk)
+        # 3. Generate a prompt for every text chunk concurrently
+        failed_chunks = 0
+        for i, prompt in enumerate(generate_prompts_for_chunks(text_chunks)):
+            if isinstance(prompt, Exception):
+                print(f"  ❌ Chunk {i+1}/{len(text_chunks)} failed: {prompt}")
+                failed_chunks += 1
+                continue
+            print(f"  -> Chunk {i+1}/{len(text_chunks)} done")
             # We add the numbering back in here for the final output file
             all_prompts.append(f"{i+1}. {prompt.strip()}")
+
+        # A prompt list with gaps would put the images out of sync with the audio,
+        # so nothing is written; a rerun only generates the failed chunks (the rest are cached)
+        if failed_chunks:
+            print(f"\n❌ {failed_chunks} of {len(text_chunks)} chunks failed; scene_prompts.txt was not written. Run again to retry them.")
+            raise SystemExit(1)
         
         # 4. Write the final, numbered list of prompts to the output file
         output_string = "\n".join(all_prompts)
@@ -6,6 +6,7 @@ from langchain.prompts import ChatPromptTemplate
 from langchain.schema.output_parser import StrOutputParser
 from dotenv import load_dotenv
 import os
+import re
 import json
 
 # === Load .env ===
@@ -45,29 +46,14 @@ chain = prompt | llm | StrOutputParser()
 result = chain.invoke({"context": summary_text})
 
 # === Parse Output ===
-titles = []
-description = ""
-hashtags = []
-
-mode = None
-for line in result.splitlines():
-    line = line.strip()
-    if line.startswith("TITLES"):
-        mode = "titles"
-        continue
-    elif line.startswith("DESCRIPTION"):
-        mode = "description"
-        continue
-    elif line.startswith("HASHTAGS"):
-        mode = "hashtags"
-        continue
-
-    if mode == "titles" and line.startswith("-"):
-        titles.append(line.lstrip("- ").strip())
-    elif mode == "description":
-        description += line + "\n"
-    elif mode == "hashtags":
-        hashtags.extend(tag for tag in line.split() if tag.startswith("#"))
+# One split on the section header lines gives ['', 'TITLES', body, 'DESCRIPTION', body, 'HASHTAGS', body]
+SECTION_HEADER_RE = re.compile(r"^[ \t]*(TITLES|DESCRIPTION|HASHTAGS)\b.*$", re.MULTILINE)
+parts = SECTION_HEADER_RE.split(result)
+sections = dict(zip(parts[1::2], parts[2::2]))
+
+titles = re.findall(r"^[ \t]*-[ \t-]*(.*?)\s*$", sections.get("TITLES", ""), re.MULTILINE)
+description = "\n".join(line.strip() for line in sections.get("DESCRIPTION", "").splitlines())
+hashtags = re.findall(r"(?<!\S)#\S+", sections.get("HASHTAGS", ""))
 
 # === Write Output Files ===
 TITLES_PATH.write_text(json.dumps(titles, indent=2), encoding="utf-8")
@@ -1,8 +1,12 @@
 import os
 import re
 import json
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from functools import lru_cache
 from pathlib import Path
 from dotenv import load_dotenv
+from google.api_core import retry as api_retry
 
 import vertexai
 from vertexai.preview.vision_models import ImageGenerationModel
@@ -10,6 +14,22 @@ from vertexai.preview.vision_models import ImageGenerationModel
 # Load environment variables
 load_dotenv()
 
+# Imagen calls are network-bound, so a few run in parallel (kept low to stay within quota)
+MAX_IMAGE_WORKERS = 4
+
+# Quota (429 RESOURCE_EXHAUSTED) and transient server errors on an Imagen call
+# are retried with exponential backoff instead of losing that image
+IMAGEN_RETRY = api_retry.Retry(
+    initial=2.0,
+    maximum=30.0,
+    multiplier=2.0,
+    timeout=120.0,
+    predicate=api_retry.if_transient_error,
+)
+
+# A numbered prompt line ("12. A wide shot of ..."), leading spaces allowed
+_NUM_PREFIX_RE = re.compile(r"^\s*\d+\.")
+
 # A global flag to ensure Vertex AI is initialized only once
 _vertex_ai_initialized = False
 
@@ -27,13 +47,39 @@ def _initialize_vertex_ai():
             print(f"❌ Error initializing Vertex AI: {e}")
             raise
 
-def create_images_from_prompts(prompts_path: str, output_dir: str) -> str:
+@lru_cache(maxsize=None)
+def _get_imagen_model(model_name: str) -> ImageGenerationModel:
+    """Loads an Imagen model once per process; later runs reuse the handle."""
+    print(f"-> Loading Imagen model: {model_name}...")
+    generation_model = ImageGenerationModel.from_pretrained(model_name)
+    print("✅ Model loaded successfully.")
+    return generation_model
+
+@IMAGEN_RETRY
+def _generate_image(generation_model, prompt_text: str):
+    """Generates a single 16:9 image for a prompt and returns it (unsaved)."""
+    response = generation_model.generate_images(
+        prompt=prompt_text,
+        number_of_images=1,
+        aspect_ratio="16:9",
+        add_watermark=False
+    )
+    return response.images[0]
+
+def _save_image(image, filepath: str) -> str:
+    """Saves a generated image to filepath (re-encoded with its generation parameters)."""
+    image.save(location=filepath)
+    return filepath
+
+def create_images_from_prompts(prompts_path: str, output_dir: str, skip_existing: bool = False) -> str:
     """
     Generates images from a file of prompts using Vertex AI and saves them to a directory.
 
     Args:
         prompts_path (str): The absolute path to the text file containing numbered prompts.
         output_dir (str): The absolute path to the directory to save the generated images.
+        skip_existing (bool): If True, prompts whose image file already exists are not
+            regenerated, so a rerun after failures only fills in the missing images.
 
     Returns:
         str: The path to the directory containing the saved images.
@@ -42,9 +88,13 @@ def create_images_from_prompts(prompts_path: str, output_dir: str) -> str:
 
     print(f"-> Loading prompts from: {prompts_path}")
     prompts_text = Path(prompts_path).read_text(encoding="utf-8")
-    # Use regex to find lines starting with a number and a period
-    numbered_prompts = [line for line in prompts_text.strip().splitlines() if re.match(r"^\d+\.", line.strip())]
-    print(f"-> Found {len(numbered_prompts)} prompts to process.")
+    # Keep lines starting with a number and a period, minus the numbering
+    prompt_texts = [
+        line.split(".", 1)[1].strip()
+        for line in prompts_text.splitlines()
+        if _NUM_PREFIX_RE.match(line)
+    ]
+    print(f"-> Found {len(prompt_texts)} prompts to process.")
 
     # Create the output directory if it doesn't exist
     Path(output_dir).mkdir(parents=True, exist_ok=True)
@@ -53,33 +103,53 @@ def create_images_from_prompts(prompts_path: str, output_dir: str) -> str:
     from src.utils.config import get_image_gen_model
     model_name = get_image_gen_model()
 
-    print(f"-> Loading Imagen model: {model_name}...")
-    generation_model = ImageGenerationModel.from_pretrained(model_name)
-    print("✅ Model loaded successfully.")
+    generation_model = _get_imagen_model(model_name)
 
+    print(f"-> Generating {len(prompt_texts)} images ({MAX_IMAGE_WORKERS} at a time)...")
     log_data = []
-    for i, prompt in enumerate(numbered_prompts):
-        try:
-            prompt_text = prompt.split(".", 1)[-1].strip()
-            print(f"\n🎨 Generating image {i+1:03} → {prompt_text[:80]}...")
-
-            response = generation_model.generate_images(
-                prompt=prompt_text,
-                number_of_images=1,
-                aspect_ratio="16:9",
-                add_watermark=False
-            )
-
-            image = response.images[0]
-            filename = f"{i+1:03}.png"
-            filepath = os.path.join(output_dir, filename)
-            image.save(location=filepath)
-
-            log_data.append({"index": i+1, "prompt": prompt_text, "filepath": filepath})
-            print(f"✅ Saved: {filepath}")
-
-        except Exception as e:
-            print(f"❌ Error generating image {i+1:03}: {e}")
+    # Saving re-encodes the PNG, so it runs on its own pool; a generation
+    # worker moves on to its next Imagen call instead of waiting on disk
+    with ThreadPoolExecutor(max_workers=MAX_IMAGE_WORKERS) as executor, \
+            ThreadPoolExecutor(max_workers=MAX_IMAGE_WORKERS) as save_pool:
+        generating = {}
+        for i, prompt_text in enumerate(prompt_texts):
+            filepath = os.path.join(output_dir, f"{i+1:03}.png")
+            if skip_existing and os.path.exists(filepath):
+                log_data.append({"index": i + 1, "prompt": prompt_text, "filepath": filepath})
+                print(f"⏭️ Image {i+1:03} already exists, skipping")
+                continue
+            future = executor.submit(contextvars.copy_context().run,
+                                     _generate_image, generation_model, prompt_text)
+            generating[future] = (i + 1, prompt_text, filepath)
+
+        # Report each image as it finishes. Workers run in a copy of this
+        # thread's context, so anything they print is routed like ours
+        saving = {}
+        pending = set(generating)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future in generating:
+                    index, prompt_text, filepath = generating[future]
+                    try:
+                        image = future.result()
+                    except Exception as e:
+                        print(f"❌ Error generating image {index:03}: {e}")
+                        continue
+                    save_future = save_pool.submit(contextvars.copy_context().run,
+                                                   _save_image, image, filepath)
+                    saving[save_future] = (index, prompt_text, filepath)
+                    pending.add(save_future)
+                else:
+                    index, prompt_text, filepath = saving[future]
+                    try:
+                        future.result()
+                        log_data.append({"index": index, "prompt": prompt_text, "filepath": filepath})
+                        print(f"✅ Saved image {index:03} → {prompt_text[:80]}")
+                    except Exception as e:
+                        print(f"❌ Error saving image {index:03}: {e}")
+
+    log_data.sort(key=lambda entry: entry["index"])
 
     # Save a log file in the same directory
     log_path = os.path.join(output_dir, "_image_log.json")
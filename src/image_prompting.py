@@ -1,12 +1,16 @@
 import os
+import re
 import math
+import hashlib
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from dotenv import load_dotenv
+from langchain_core.messages import SystemMessage
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.output_parsers import StrOutputParser
-from pydub import AudioSegment
-from src.utils.config import get_prompting_llm
+from pydub.utils import mediainfo
+from src.utils.config import get_prompting_llm, get_chat_llm
 
 # Load environment variables
 load_dotenv()
@@ -16,30 +20,61 @@ load_dotenv()
 # Change this one value to adjust how many images are generated for the video.
 SECONDS_PER_IMAGE = 20
 
-# Initialize the language model (using config-driven model selection)
-llm = ChatGoogleGenerativeAI(
-    model=get_prompting_llm(),
-    google_api_key=os.getenv("GOOGLE_API_KEY"),
-    temperature=0.8,
-)
+# How many scene prompts are requested from Gemini at once
+MAX_CONCURRENT_PROMPTS = 8
+
+# A word, for chunking: any run of non-whitespace
+_WORD_RE = re.compile(r"\S+")
+
+# Generated style bibles are cached by a hash of the script, so the same script
+# (rewritten unchanged, or in another project) skips the LLM call
+STYLE_BIBLE_CACHE_DIR = os.path.join(tempfile.gettempdir(), "style_bible_cache")
+
+# Sampling temperature for the prompting model
+LLM_TEMPERATURE = 0.8
 
 def _calculate_num_images(audio_path: str, seconds_per_image: int) -> int:
     """Calculates the number of images needed based on audio length."""
-    audio = AudioSegment.from_mp3(audio_path)
-    duration_seconds = len(audio) / 1000
+    # ffprobe reads the duration from the file's headers; decoding the whole
+    # MP3 to PCM just to measure it took seconds and hundreds of MB on long audio
+    info = mediainfo(audio_path)
+    if "duration" not in info:
+        # mediainfo() returns {} when ffprobe is missing or can't read the file
+        raise RuntimeError(
+            f"Could not read the duration of {audio_path}. "
+            "Check that it is a valid audio file and that ffprobe (part of ffmpeg) is installed."
+        )
+    duration_seconds = float(info["duration"])
     return math.ceil(duration_seconds / seconds_per_image)
 
-def _split_summary_into_chunks(summary: str, num_chunks: int) -> list[str]:
-    """Splits the summary text into a specified number of roughly equal chunks."""
-    words = summary.split()
-    if not words:
+def _chunk_offsets(summary: str, num_chunks: int) -> list[tuple[int, int]]:
+    """
+    Finds (start, end) character offsets that split the summary into num_chunks
+    chunks whose word counts differ by at most one (the first chunks take the
+    remainder), so every image gets its share. Slicing the summary with them
+    keeps its original punctuation and line breaks.
+    """
+    total_words = sum(1 for _ in _WORD_RE.finditer(summary))
+    if total_words == 0:
         return []
-    words_per_chunk = math.ceil(len(words) / num_chunks)
-    text_chunks = []
-    for i in range(0, len(words), words_per_chunk):
-        chunk = " ".join(words[i:i + words_per_chunk])
-        text_chunks.append(chunk)
-    return text_chunks
+    base_size, remainder = divmod(total_words, num_chunks)
+
+    offsets = []
+    chunk_start = None
+    words_left = base_size + (1 if remainder else 0)
+    for match in _WORD_RE.finditer(summary):
+        if chunk_start is None:
+            chunk_start = match.start()
+        words_left -= 1
+        if words_left == 0:
+            offsets.append((chunk_start, match.end()))
+            chunk_start = None
+            words_left = base_size + (1 if len(offsets) < remainder else 0)
+    return offsets
+
+def _split_summary_into_chunks(summary: str, num_chunks: int) -> list[str]:
+    """Splits the summary text into num_chunks roughly equal chunks (see _chunk_offsets)."""
+    return [summary[start:end] for start, end in _chunk_offsets(summary, num_chunks)]
 
 def _generate_style_bible(summary_text: str) -> str:
     """Generates a Visual Style Bible from the full script text in 1_summary.txt.
@@ -72,7 +107,7 @@ def _generate_style_bible(summary_text: str) -> str:
         ("user", "Script:\n\n{summary_text}")
     ])
 
-    chain = prompt_template | llm | StrOutputParser()
+    chain = prompt_template | get_chat_llm(get_prompting_llm(), LLM_TEMPERATURE) | StrOutputParser()
     style_bible = chain.invoke({"summary_text": summary_text})
     style_bible = style_bible.strip()
 
@@ -80,6 +115,12 @@ def _generate_style_bible(summary_text: str) -> str:
     return style_bible
 
 
+def _style_bible_cache_path(summary_text: str) -> str:
+    """Returns the cache file for the style bible of this exact script."""
+    script_hash = hashlib.sha256(summary_text.encode("utf-8")).hexdigest()
+    return os.path.join(STYLE_BIBLE_CACHE_DIR, f"{script_hash}.txt")
+
+
 def generate_image_prompts(summary_path: str, audio_path: str, prompts_path: str, seconds_per_image: int = 20, style_bible_path: str = None) -> str:
     """
     Generates a synchronized list of image prompts based on a summary and an audio file.
@@ -95,7 +136,8 @@ def generate_image_prompts(summary_path: str, audio_path: str, prompts_path: str
         seconds_per_image (int): Seconds of audio per image. Defaults to 20.
         style_bible_path (str, optional): Path to an existing style bible file.
             If provided and the file exists, skips regeneration and loads from file.
-            If None, auto-derives path as 3a_style_bible.txt in the project directory.
+            If None, auto-derives path as 3a_style_bible.txt in the project directory,
+            which is reused unless the summary has changed since it was written.
 
     Returns:
         str: The path to the saved prompts file.
@@ -104,51 +146,79 @@ def generate_image_prompts(summary_path: str, audio_path: str, prompts_path: str
     print(f"   - Summary: {summary_path}")
     print(f"   - Audio: {audio_path}")
 
-    # 1. Calculate the number of images needed
-    num_images = _calculate_num_images(audio_path, SECONDS_PER_IMAGE)
-    print(f"-> Audio duration requires {num_images} images (at {SECONDS_PER_IMAGE}s/image).")
+    # 1. Start measuring the audio; the ffprobe run overlaps with reading the
+    # summary and preparing the style bible, which don't depend on it
+    probe_executor = ThreadPoolExecutor(max_workers=1)
+    num_images_future = probe_executor.submit(_calculate_num_images, audio_path, SECONDS_PER_IMAGE)
+    probe_executor.shutdown(wait=False)
 
-    # 2. Read and split the summary text
+    # 2. Read the summary text
     summary_text = Path(summary_path).read_text(encoding="utf-8").strip()
-    text_chunks = _split_summary_into_chunks(summary_text, num_images)
-    print(f"-> Summary split into {len(text_chunks)} chunks to match images.")
 
     # 3. Generate or load Visual Style Bible
     project_dir = os.path.dirname(prompts_path)
+    explicit_style_bible = style_bible_path is not None
     if style_bible_path is None:
         style_bible_path = os.path.join(project_dir, "3a_style_bible.txt")
 
-    if os.path.exists(style_bible_path) and os.path.getsize(style_bible_path) > 0:
+    # The project's bible (possibly hand-edited) is kept unless the summary was
+    # rewritten after it, in which case it may describe a different script
+    bible_is_current = os.path.exists(style_bible_path) and os.path.getsize(style_bible_path) > 0 and (
+        explicit_style_bible or os.path.getmtime(style_bible_path) >= os.path.getmtime(summary_path)
+    )
+    if bible_is_current:
         print(f"-> Loading existing Style Bible from: {style_bible_path}")
         style_bible = Path(style_bible_path).read_text(encoding="utf-8").strip()
     else:
-        style_bible = _generate_style_bible(summary_text)
+        cache_path = _style_bible_cache_path(summary_text)
+        if os.path.exists(cache_path) and os.path.getsize(cache_path) > 0:
+            print("-> Reusing cached Style Bible for this script")
+            style_bible = Path(cache_path).read_text(encoding="utf-8").strip()
+        else:
+            style_bible = _generate_style_bible(summary_text)
+            os.makedirs(STYLE_BIBLE_CACHE_DIR, exist_ok=True)
+            Path(cache_path).write_text(style_bible, encoding="utf-8")
         os.makedirs(project_dir, exist_ok=True)
         Path(style_bible_path).write_text(style_bible, encoding="utf-8")
         print(f"-> Style Bible saved to: {style_bible_path}")
 
-    # 4. Generate a prompt for each text chunk
+    # 4. Split the summary to match the number of images needed
+    num_images = num_images_future.result()
+    print(f"-> Audio duration requires {num_images} images (at {SECONDS_PER_IMAGE}s/image).")
+    # Only the chunk boundaries are computed here; each chunk is sliced out of
+    # the summary when the batch input is built below
+    chunk_offsets = _chunk_offsets(summary_text, num_images)
+    print(f"-> Summary split into {len(chunk_offsets)} chunks to match images.")
+
+    # 5. Generate a prompt for each text chunk
     prompt_template = ChatPromptTemplate.from_messages([
         ("system", (
             "You are a visual scene director. Your job is to create a single, vivid visual prompt for an AI image generator. You must include these words (and more like them) in every prompt: [photorealistic] [high-resolution] [realistic lighting].\n"
             "The prompt should be a cinematic, highly-detailed description of the key idea in the following text chunk. Focus on one clear moment. Keep the prompt under 200 words.\n"
             "Output only the prompt itself — no extra text, no numbering, no explanations.\n"
-            "Focus on the information. For example: if it says Claude 4, Gemini 2.5, ChatGPT, Poe, Perplexity, Apple, OpenAI, Anthropic, Gork, Mistral, Ollama, Meta, or any other brand or industry terms etc. try to include those words into your prompt and make sure those are reflected on the images. This is why, since we are using auto generated images, those words will be used a the visual queues for our viewers while audio is playing. It's always better when the user sees the text written clearly while the words are being said. This anchors the viewer with the audio to the visuals. So this is very important that the images we create reflect what is being said ... if possible, let's push for making visuals as realistic as possible ... like taken images from the real world. Try to make it look like the real thing. For example, when we talk about ChatGPT, try to show screens from ChatGPT with openai logos etc. When Poe is being talked about ... let's show Poe.com logo ... same way anthropic logo etc. so that the viewer can identify with what they know about with what is being said in the audio.\n\n"
+            "Focus on the information. For example: if it says Claude 4, Gemini 2.5, ChatGPT, Poe, Perplexity, Apple, OpenAI, Anthropic, Gork, Mistral, Ollama, Meta, or any other brand or industry terms etc. try to include those words into your prompt and make sure those are reflected on the images. This is why, since we are using auto generated images, those words will be used a the visual queues for our viewers while audio is playing. It's always better when the user sees the text written clearly while the words are being said. This anchors the viewer with the audio to the visuals. So this is very important that the images we create reflect what is being said ... if possible, let's push for making visuals as realistic as possible ... like taken images from the real world. Try to make it look like the real thing. For example, when we talk about ChatGPT, try to show screens from ChatGPT with openai logos etc. When Poe is being talked about ... let's show Poe.com logo ... same way anthropic logo etc. so that the viewer can identify with what they know about with what is being said in the audio."
+        )),
+        # Built once per run and identical for every chunk, so the whole prefix
+        # up to the text chunk is byte-identical across calls (cache-friendly).
+        # A message object isn't templated, so braces in the bible are safe.
+        SystemMessage(content=(
             "VISUAL STYLE BIBLE (apply this visual style consistently to your prompt — do NOT copy it verbatim into your output):\n"
-            "{style_bible}"
+            f"{style_bible}"
         )),
         ("user", "Text Chunk: \"{text_chunk}\"")
     ])
-    chain = prompt_template | llm | StrOutputParser()
-
-    all_prompts = []
-    print(f"-> Generating {len(text_chunks)} prompts...")
-    for i, chunk in enumerate(text_chunks):
-        print(f"   - Processing chunk {i+1}/{len(text_chunks)}...")
-        prompt = chain.invoke({"text_chunk": chunk, "style_bible": style_bible})
-        all_prompts.append(f"{i+1}. {prompt.strip()}")
-
-    # 5. Write the final list of prompts to the output file
+    chain = prompt_template | get_chat_llm(get_prompting_llm(), LLM_TEMPERATURE) | StrOutputParser()
+
+    print(f"-> Generating {len(chunk_offsets)} prompts (up to {MAX_CONCURRENT_PROMPTS} at a time)...")
+    # Each chunk's prompt is independent, so the calls run concurrently;
+    # batch() returns the results in input order
+    results = chain.batch(
+        [{"text_chunk": summary_text[start:end]} for start, end in chunk_offsets],
+        config={"max_concurrency": MAX_CONCURRENT_PROMPTS},
+    )
+    all_prompts = [f"{i+1}. {prompt.strip()}" for i, prompt in enumerate(results)]
+
+    # 6. Write the final list of prompts to the output file
     output_string = "\n".join(all_prompts)
     output_dir = os.path.dirname(prompts_path)
     os.makedirs(output_dir, exist_ok=True)
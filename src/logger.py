@@ -5,16 +5,45 @@ Logs to both console and file with timestamps.
 
 import os
 import sys
+import time
+import atexit
+import threading
 from datetime import datetime
 from pathlib import Path
 
 
+# Log lines are buffered and flushed to disk in the background at this
+# interval (seconds), so a crash loses at most about this much of the log
+LOG_FLUSH_INTERVAL = 1.0
+
+# (epoch second, "HH:MM:SS") of the last timestamp formatted
+_last_timestamp = (None, "")
+
+
+def _timestamp():
+    """Current time as HH:MM:SS, formatted at most once per second."""
+    global _last_timestamp
+    now_s = int(time.time())
+    second, text = _last_timestamp
+    if now_s != second:
+        # Every printed line is timestamped, so lines within the same
+        # second reuse the string instead of formatting it again
+        text = time.strftime("%H:%M:%S", time.localtime(now_s))
+        _last_timestamp = (now_s, text)
+    return text
+
+
 class Logger:
     """Simple logger that writes to both console and file."""
     
     def __init__(self, log_dir="logs"):
         self.log_dir = log_dir
         self.log_file = None
+        # Guards every write, flush and close of log_file: the background
+        # flusher, TeeOutput and the logger itself all touch the same handle
+        self.lock = threading.Lock()
+        self._stop_flushing = None
+        self._flusher = None
         self._original_stdout = sys.stdout
         self._original_stderr = sys.stderr
         
@@ -29,7 +58,19 @@ class Logger:
             filename = f"{timestamp}.log"
         
         log_path = os.path.join(self.log_dir, filename)
-        self.log_file = open(log_path, "w", encoding="utf-8")
+        # One buffered handle for the whole session; lines reach disk in
+        # batches from the background flusher instead of one write() each
+        self.log_file = open(log_path, "w", encoding="utf-8", buffering=64 * 1024)
+        self._stop_flushing = threading.Event()
+        self._flusher = threading.Thread(
+            target=self._flush_periodically,
+            args=(self.log_file, self.lock, self._stop_flushing),
+            daemon=True
+        )
+        self._flusher.start()
+        # Whatever is still buffered is written out even if stop() is never
+        # called; stop() unregisters this again
+        atexit.register(self.stop)
         
         # Write header
         self._write_to_file(f"=== Bibo Video Generator Log ===")
@@ -40,12 +81,20 @@ class Logger:
         
         return log_path
     
+    @staticmethod
+    def _flush_periodically(log_file, lock, stop_event):
+        """Flush the log file every LOG_FLUSH_INTERVAL seconds until stopped."""
+        while not stop_event.wait(LOG_FLUSH_INTERVAL):
+            with lock:
+                if log_file.closed:
+                    return
+                log_file.flush()
+
     def _write_to_file(self, message):
         """Write message to log file with timestamp."""
-        if self.log_file:
-            timestamp = datetime.now().strftime("%H:%M:%S")
-            self.log_file.write(f"[{timestamp}] {message}\n")
-            self.log_file.flush()
+        with self.lock:
+            if self.log_file and not self.log_file.closed:
+                self.log_file.write(f"[{_timestamp()}] {message}\n")
     
     def log(self, message):
         """Log message to both console and file."""
@@ -55,32 +104,37 @@ class Logger:
     def stop(self):
         """Stop logging and close file."""
         if self.log_file:
+            atexit.unregister(self.stop)
+            self._stop_flushing.set()
+            self._flusher.join()
             self._write_to_file("\n" + "=" * 40)
             self._write_to_file(f"Ended: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-            self.log_file.close()
-            self.log_file = None
+            with self.lock:
+                self.log_file.close()
+                self.log_file = None
 
 
 class TeeOutput:
     """Tee stdout/stderr to both console and log file."""
     
-    def __init__(self, original, log_file):
+    def __init__(self, original, log_file, lock=None):
         self.original = original
         self.log_file = log_file
+        # Shared with the logger that owns log_file (see Logger.lock)
+        self.lock = lock or threading.Lock()
     
     def write(self, message):
         self.original.write(message)
         if self.log_file and message.strip():
-            timestamp = datetime.now().strftime("%H:%M:%S")
-            self.log_file.write(f"[{timestamp}] {message}")
-            if not message.endswith("\n"):
-                self.log_file.write("\n")
-            self.log_file.flush()
+            newline = "" if message.endswith("\n") else "\n"
+            with self.lock:
+                if not self.log_file.closed:
+                    self.log_file.write(f"[{_timestamp()}] {message}{newline}")
     
     def flush(self):
+        # The log file is flushed by the logger's background flusher, so
+        # frequent flush() calls (progress bars etc.) don't each hit the disk
         self.original.flush()
-        if self.log_file:
-            self.log_file.flush()
 
 
 # Global logger instance
@@ -94,8 +148,8 @@ def init_logging(project_name=None, log_dir="logs"):
     log_path = _logger.start(project_name)
     
     # Redirect stdout and stderr to tee
-    sys.stdout = TeeOutput(sys.__stdout__, _logger.log_file)
-    sys.stderr = TeeOutput(sys.__stderr__, _logger.log_file)
+    sys.stdout = TeeOutput(sys.__stdout__, _logger.log_file, _logger.lock)
+    sys.stderr = TeeOutput(sys.__stderr__, _logger.log_file, _logger.lock)
     
     return log_path
 
@@ -3,57 +3,82 @@ import json
 from pathlib import Path
 from dotenv import load_dotenv
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.output_parsers import StrOutputParser
-from src.utils.config import get_prompting_llm
+from src.utils.config import get_prompting_llm, get_chat_llm
 
 # Load environment variables
 load_dotenv()
 
-# Initialize the language model (using config-driven model selection)
-llm = ChatGoogleGenerativeAI(
-    model=get_prompting_llm(),
-    google_api_key=os.getenv("GOOGLE_API_KEY"),
-    temperature=0.8,
+# Sampling temperature for the prompting model
+LLM_TEMPERATURE = 0.8
+
+# Section headers in the LLM's metadata output, and the parser mode each starts
+_SECTION_HEADERS = (
+    ("TITLES:", "titles"),
+    ("DESCRIPTION:", "description"),
+    ("HASHTAGS:", "hashtags"),
 )
 
+class _MetadataParser:
+    """
+    Incremental parser for the LLM's metadata output. Text can be fed in as it
+    streams (split anywhere, even mid-line); complete lines are parsed right away
+    and the trailing partial line is held until the rest of it arrives.
+    """
+
+    def __init__(self):
+        self.metadata = {
+            "titles": [],
+            "description": "",
+            "hashtags": []
+        }
+        self.mode = None
+        self.description_lines = []
+        self.partial_line = ""
+
+    def feed(self, text: str) -> None:
+        """Parses every line completed by this piece of text."""
+        if "\n" not in text:
+            self.partial_line += text
+            return
+        *lines, self.partial_line = (self.partial_line + text).split("\n")
+        for line in lines:
+            self._parse_line(line)
+
+    def close(self) -> dict:
+        """Parses any final unterminated line and returns the metadata."""
+        if self.partial_line:
+            self._parse_line(self.partial_line)
+            self.partial_line = ""
+        self.metadata["description"] = "\n".join(self.description_lines).strip()
+        return self.metadata
+
+    def _parse_line(self, line: str) -> None:
+        line_stripped = line.strip()
+        for header, mode in _SECTION_HEADERS:
+            if line_stripped.startswith(header):
+                self.mode = mode
+                # Description and hashtags may start on the header line itself;
+                # titles are only ever read from the "- " lines that follow
+                line_stripped = line_stripped[len(header):].strip()
+                if not line_stripped or mode == "titles":
+                    return
+                break
+
+        if self.mode == "titles":
+            if line_stripped.startswith("-"):
+                self.metadata["titles"].append(line_stripped.lstrip("- ").strip())
+        elif self.mode == "description":
+            self.description_lines.append(line_stripped)
+        elif self.mode == "hashtags":
+            self.metadata["hashtags"].extend(tag for tag in line_stripped.split() if tag.startswith("#"))
+
+
 def parse_metadata_output(raw_text: str) -> dict:
     """Parses the raw LLM output into a structured dictionary."""
-    metadata = {
-        "titles": [],
-        "description": "",
-        "hashtags": []
-    }
-    mode = None
-    description_lines = []
-
-    for line in raw_text.splitlines():
-        line_stripped = line.strip()
-        if line_stripped.startswith("TITLES:"):
-            mode = "titles"
-            continue
-        elif line_stripped.startswith("DESCRIPTION:"):
-            mode = "description"
-            # Handle case where description is on the same line
-            if len(line_stripped) > len("DESCRIPTION:"):
-                description_lines.append(line_stripped[len("DESCRIPTION:"):].strip())
-            continue
-        elif line_stripped.startswith("HASHTAGS:"):
-            mode = "hashtags"
-            # Handle case where hashtags are on the same line
-            if len(line_stripped) > len("HASHTAGS:"):
-                metadata["hashtags"].extend(tag for tag in line_stripped[len("HASHTAGS:"):].split() if tag.startswith("#"))
-            continue
-
-        if mode == "titles" and line_stripped.startswith("-"):
-            metadata["titles"].append(line_stripped.lstrip("- ").strip())
-        elif mode == "description":
-            description_lines.append(line_stripped)
-        elif mode == "hashtags":
-            metadata["hashtags"].extend(tag for tag in line_stripped.split() if tag.startswith("#"))
-    
-    metadata["description"] = "\n".join(description_lines).strip()
-    return metadata
+    parser = _MetadataParser()
+    parser.feed(raw_text)
+    return parser.close()
 
 def generate_metadata(summary_path: str, output_path: str) -> str:
     """
@@ -82,13 +107,19 @@ def generate_metadata(summary_path: str, output_path: str) -> str:
     ])
 
     print("-> Creating metadata generation chain...")
-    chain = prompt | llm | StrOutputParser()
-
-    print("-> Invoking chain to generate metadata...")
-    raw_result = chain.invoke({"context": summary_text})
-
-    print("-> Parsing LLM output...")
-    parsed_metadata = parse_metadata_output(raw_result)
+    chain = prompt | get_chat_llm(get_prompting_llm(), LLM_TEMPERATURE) | StrOutputParser()
+
+    print("-> Streaming metadata from the LLM...")
+    # Parsed as it arrives, so titles show up in the log before the rest is written
+    parser = _MetadataParser()
+    titles = parser.metadata["titles"]
+    titles_reported = 0
+    for chunk in chain.stream({"context": summary_text}):
+        parser.feed(chunk)
+        for title in titles[titles_reported:]:
+            print(f"   - Title: {title}")
+        titles_reported = len(titles)
+    parsed_metadata = parser.close()
 
     # Ensure the output directory exists
     output_dir = os.path.dirname(output_path)
@@ -126,7 +157,7 @@ def regenerate_titles(summary_path: str, metadata_path: str) -> list:
     ])
     
     print("-> Generating new titles...")
-    chain = prompt | llm | StrOutputParser()
+    chain = prompt | get_chat_llm(get_prompting_llm(), LLM_TEMPERATURE) | StrOutputParser()
     raw_result = chain.invoke({"context": summary_text})
     
     # Parse titles
@@ -170,7 +201,7 @@ def regenerate_description(summary_path: str, metadata_path: str) -> str:
     ])
     
     print("-> Generating new description...")
-    chain = prompt | llm | StrOutputParser()
+    chain = prompt | get_chat_llm(get_prompting_llm(), LLM_TEMPERATURE) | StrOutputParser()
     new_description = chain.invoke({"context": summary_text})
     
     # Load existing metadata and update description
@@ -1,22 +1,52 @@
 import os
 from pathlib import Path
 from dotenv import load_dotenv
-from langchain_community.document_loaders import TextLoader
+from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain.chains.combine_documents import create_stuff_documents_chain
-from src.utils.config import get_summarization_llm
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+from src.utils.config import get_summarization_llm, get_chat_llm
 
 # Load environment variables
 load_dotenv()
 
-# Initialize the language model (using config-driven model selection)
-llm = ChatGoogleGenerativeAI(
-    model=get_summarization_llm(),
-    google_api_key=os.getenv("GOOGLE_API_KEY"),
-    temperature=0.5,
-    # max_output_tokens=4096,  # REMOVED - was causing truncation
-)
+# Sampling temperature for the script-writing model (max_output_tokens is left
+# unset: a limit was truncating scripts)
+LLM_TEMPERATURE = 0.5
+
+# Transcripts longer than this are condensed section by section (in parallel)
+# before the final script is written, instead of in one very long LLM call
+MAP_REDUCE_THRESHOLD_CHARS = 120_000
+MAP_CHUNK_SIZE = 8000
+MAP_CHUNK_OVERLAP = 400
+MAX_CONCURRENT_SECTIONS = 8
+
+def _condense_sections(transcript: str) -> str:
+    """
+    Map step for long transcripts: splits them into overlapping sections and
+    condenses each into dense notes concurrently. Returns the notes joined in
+    transcript order, ready for the script prompt.
+    """
+    splitter = RecursiveCharacterTextSplitter(chunk_size=MAP_CHUNK_SIZE, chunk_overlap=MAP_CHUNK_OVERLAP)
+    sections = splitter.split_text(transcript)
+    print(f"-> Long transcript: condensing {len(sections)} sections ({MAX_CONCURRENT_SECTIONS} at a time)...")
+
+    map_prompt = ChatPromptTemplate.from_messages([
+        (
+            "system",
+            (
+                "You condense one section of a longer video transcript into dense notes for a script writer.\n"
+                "Keep every fact, name, number, comparison and example. Drop ads, sponsorships and filler.\n"
+                "Output only the notes as plain prose — no headings, no bullet symbols, no framing."
+            )
+        ),
+        ("user", "{section}")
+    ])
+    map_chain = map_prompt | get_chat_llm(get_summarization_llm(), LLM_TEMPERATURE) | StrOutputParser()
+    notes = map_chain.batch(
+        [{"section": section} for section in sections],
+        config={"max_concurrency": MAX_CONCURRENT_SECTIONS},
+    )
+    return "\n\n".join(notes)
 
 def summarize_transcript(transcript_path: str, summary_path: str) -> str:
     """
@@ -30,8 +60,8 @@ def summarize_transcript(transcript_path: str, summary_path: str) -> str:
         str: The path to the saved summary file.
     """
     print(f"-> Loading transcript from: {transcript_path}")
-    loader = TextLoader(transcript_path)
-    docs = loader.load()
+    # A single file needs no document loader; the text goes straight into the prompt
+    transcript = Path(transcript_path).read_text(encoding="utf-8")
 
     prompt = ChatPromptTemplate.from_messages([
         (
@@ -66,11 +96,15 @@ def summarize_transcript(transcript_path: str, summary_path: str) -> str:
         )
     ])
 
+    # Very long transcripts are condensed first; the script prompt then runs over the notes
+    if len(transcript) > MAP_REDUCE_THRESHOLD_CHARS:
+        transcript = _condense_sections(transcript)
+
     print("-> Creating summarization chain...")
-    chain = create_stuff_documents_chain(llm, prompt)
+    chain = prompt | get_chat_llm(get_summarization_llm(), LLM_TEMPERATURE) | StrOutputParser()
     
     print("-> Invoking chain to generate summary...")
-    result = chain.invoke({"context": docs})
+    result = chain.invoke({"context": transcript})
     
     # Ensure the output directory exists
     output_dir = os.path.dirname(summary_path)
@@ -1,10 +1,14 @@
+import hashlib
+import json
 import os
+import subprocess
+import sys
 import tempfile
 import time
 import uuid
 from pathlib import Path
 from dotenv import load_dotenv
-from yt_dlp import YoutubeDL
+from google.api_core import retry as api_retry
 from google.cloud import speech
 from google.cloud import storage
 
@@ -18,58 +22,126 @@ DEFAULT_LANGUAGE = "en-US"
 # For larger files, we must upload to GCS
 MAX_INLINE_AUDIO_SIZE = 10 * 1024 * 1024  # 10MB in bytes
 
+# StreamingRecognize accepts at most ~5 minutes of audio per stream, so only
+# clips under this length are streamed; longer audio goes through GCS
+MAX_STREAMING_DURATION_SECONDS = 290
+
+# Bytes of FLAC sent per StreamingRecognizeRequest (API limit is 25KB per request)
+STREAMING_CHUNK_SIZE = 16 * 1024
+
+# Transient Speech-to-Text failures (503 UNAVAILABLE, 429 RESOURCE_EXHAUSTED, 500)
+# are retried with exponential backoff instead of failing the whole transcription
+STT_RETRY = api_retry.Retry(
+    initial=1.0,
+    maximum=60.0,
+    multiplier=2.0,
+    timeout=600.0,
+    predicate=api_retry.if_transient_error,
+)
+
+# Transcripts are cached by a hash of the audio, so re-running a project
+# (or transcribing the same video again) skips the Speech-to-Text call
+TRANSCRIPT_CACHE_DIR = os.path.join(tempfile.gettempdir(), "transcription_cache")
+
 def _download_audio_to_temp(url: str) -> str:
-    """Downloads audio to a temporary file and returns the path."""
-    temp_dir = tempfile.gettempdir()
-    temp_audio_path = os.path.join(temp_dir, "temp_audio_for_transcription.mp3")
-    
-    ydl_opts = {
-        'format': 'bestaudio*',  # Accept any audio format
-        'outtmpl': os.path.join(temp_dir, "temp_audio_for_transcription.%(ext)s"),
-        'quiet': False,
-        'no_warnings': False,
-    }
-    
-    with YoutubeDL(ydl_opts) as ydl:
-        info = ydl.extract_info(url, download=True)
-        downloaded_file = ydl.prepare_filename(info)
-    
-    # Convert to mp3 if not already
-    if not downloaded_file.endswith('.mp3'):
-        from pydub import AudioSegment
-        audio = AudioSegment.from_file(downloaded_file)
-        audio.export(temp_audio_path, format='mp3', bitrate='192k')
-        # Clean up original file
-        if os.path.exists(downloaded_file):
-            os.remove(downloaded_file)
-    else:
-        temp_audio_path = downloaded_file
-    
-    return temp_audio_path
+    """
+    Streams the best audio track from yt-dlp straight into ffmpeg, which writes a
+    temporary mono 16kHz FLAC file (optimal for Speech-to-Text), and returns its path.
+    Conversion starts as soon as the first bytes arrive instead of after the
+    whole download has landed on disk.
+    """
+    from pydub import AudioSegment
+
+    flac_path = os.path.join(tempfile.gettempdir(), "temp_audio_for_transcription.flac")
+
+    # stderr goes to a temp file so a chatty downloader can't fill the pipe and stall
+    with tempfile.TemporaryFile() as downloader_err:
+        downloader = subprocess.Popen(
+            [
+                sys.executable, "-m", "yt_dlp",
+                "--format", "bestaudio*",  # Accept any audio format
+                "--quiet",
+                "--no-warnings",
+                "--output", "-",  # Write the media to stdout
+                url,
+            ],
+            stdout=subprocess.PIPE,
+            stderr=downloader_err,
+        )
+        converter = subprocess.Popen(
+            [
+                AudioSegment.converter,  # Same ffmpeg binary pydub is configured with
+                "-y",
+                "-loglevel", "error",
+                "-i", "pipe:0",
+                "-ac", "1",
+                "-ar", "16000",
+                flac_path,
+            ],
+            stdin=downloader.stdout,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
+        # Let yt-dlp see a broken pipe if ffmpeg exits early
+        downloader.stdout.close()
+
+        _, converter_stderr = converter.communicate()
+        downloader.wait()
+
+        downloader_err.seek(0)
+        downloader_stderr = downloader_err.read()
+
+    if downloader.returncode != 0 or converter.returncode != 0:
+        if os.path.exists(flac_path):
+            os.remove(flac_path)
+        if downloader.returncode != 0:
+            raise RuntimeError(
+                f"yt-dlp failed to download audio: {downloader_stderr.decode(errors='replace').strip()}"
+            )
+        raise RuntimeError(
+            f"ffmpeg failed to convert audio: {converter_stderr.decode(errors='replace').strip()}"
+        )
+
+    return flac_path
 
 def _get_speech_client():
     """Returns a Google Cloud Speech client. Uses ADC for authentication."""
     return speech.SpeechClient()
 
 
-def _convert_to_flac(mp3_path: str) -> str:
-    """Converts MP3 to FLAC for better Speech-to-Text compatibility."""
-    from pydub import AudioSegment
-    
-    flac_path = mp3_path.replace(".mp3", ".flac")
-    audio = AudioSegment.from_mp3(mp3_path)
-    
-    # Convert to mono and 16kHz sample rate (optimal for Speech-to-Text)
-    audio = audio.set_channels(1)
-    audio = audio.set_frame_rate(16000)
-    
-    audio.export(flac_path, format="flac")
-    return flac_path
+def _get_audio_duration(file_path: str):
+    """Returns the audio duration in seconds, or None if it cannot be probed."""
+    from pydub.utils import mediainfo
+
+    try:
+        return float(mediainfo(file_path)["duration"])
+    except Exception:
+        return None
+
+
+def _streaming_recognize(client, config, flac_path: str) -> list:
+    """
+    Streams a short FLAC file to Speech-to-Text in small requests, so the upload
+    overlaps with recognition, and returns the finalized transcript parts.
+    """
+    streaming_config = speech.StreamingRecognitionConfig(config=config, interim_results=False)
+
+    def _audio_requests():
+        with open(flac_path, "rb") as f:
+            for chunk in iter(lambda: f.read(STREAMING_CHUNK_SIZE), b""):
+                yield speech.StreamingRecognizeRequest(audio_content=chunk)
+
+    transcript_parts = []
+    for response in client.streaming_recognize(streaming_config, _audio_requests()):
+        for result in response.results:
+            if result.is_final and result.alternatives:
+                transcript_parts.append(result.alternatives[0].transcript)
+    return transcript_parts
 
 
-def _upload_to_gcs(file_path: str) -> str:
+def _upload_to_gcs(file_path: str) -> tuple:
     """
-    Uploads a file to Google Cloud Storage and returns the GCS URI.
+    Uploads a file to Google Cloud Storage and returns the GCS URI and blob.
     Uses a temporary bucket or the bucket specified in GOOGLE_STT_BUCKET env var.
     """
     bucket_name = os.getenv("GOOGLE_STT_BUCKET")
@@ -104,6 +176,106 @@ def _delete_from_gcs(blob):
         print(f"   - Warning: Could not delete GCS file {blob.name}: {e}")
 
 
+def _audio_cache_key(file_path: str, config: speech.RecognitionConfig) -> str:
+    """
+    Returns a SHA-256 hex digest of the audio bytes and the full recognition
+    config (language, model, use_enhanced, punctuation...), used as the cache key.
+    """
+    config_json = speech.RecognitionConfig.to_json(config, sort_keys=True, indent=None)
+    digest = hashlib.sha256(config_json.encode("utf-8"))
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _load_cached_transcript(cache_key: str):
+    """Returns the cached transcript for this key, or None if there isn't a usable one."""
+    cache_path = os.path.join(TRANSCRIPT_CACHE_DIR, f"{cache_key}.json")
+    if not os.path.exists(cache_path):
+        return None
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            return json.load(f)["text"]
+    except (OSError, ValueError, KeyError) as e:
+        print(f"   - Warning: Ignoring unreadable transcript cache {cache_path}: {e}")
+        return None
+
+
+def _save_cached_transcript(cache_key: str, transcript: str):
+    """Stores a transcript in the cache under the given key."""
+    os.makedirs(TRANSCRIPT_CACHE_DIR, exist_ok=True)
+    cache_path = os.path.join(TRANSCRIPT_CACHE_DIR, f"{cache_key}.json")
+    with open(cache_path, "w", encoding="utf-8") as f:
+        json.dump({"text": transcript}, f)
+
+
+def _build_recognition_config(language_code: str) -> speech.RecognitionConfig:
+    """
+    Builds the recognition config for 16kHz mono FLAC audio.
+    The enhanced "video" model is opt-in via GOOGLE_STT_ENHANCED=true: it can be
+    more accurate but takes markedly longer than "latest_long".
+    """
+    if os.getenv("GOOGLE_STT_ENHANCED", "").lower() in ("1", "true", "yes"):
+        model_kwargs = {"use_enhanced": True, "model": "video"}
+    else:
+        model_kwargs = {"model": "latest_long"}  # Optimized for long-form content like videos
+
+    return speech.RecognitionConfig(
+        encoding=speech.RecognitionConfig.AudioEncoding.FLAC,
+        sample_rate_hertz=16000,
+        language_code=language_code,
+        enable_automatic_punctuation=True,
+        **model_kwargs,
+    )
+
+
+def _recognize_flac(flac_path: str, language_code: str) -> str:
+    """
+    Runs Google Cloud Speech-to-Text on a 16kHz mono FLAC file and returns the transcript.
+    Short clips are streamed directly; longer audio is uploaded to GCS for a
+    long-running recognition job.
+    """
+    duration = _get_audio_duration(flac_path)
+
+    print(f"-> Transcribing audio with Google Cloud Speech-to-Text ({language_code})...")
+    client = _get_speech_client()
+
+    config = _build_recognition_config(language_code)
+
+    if duration is not None and duration <= MAX_STREAMING_DURATION_SECONDS:
+        # Short clips: stream straight to the recognizer, no GCS round-trip
+        print(f"   - Audio is {duration:.0f}s, streaming directly to Speech-to-Text...")
+        # Retry re-runs the whole stream, since a half-consumed request generator can't be replayed
+        return " ".join(STT_RETRY(_streaming_recognize)(client, config, flac_path))
+
+    # Long audio exceeds the streaming limit, so upload to GCS
+    # and run a single long-running recognition job
+    print("   - Uploading to Google Cloud Storage for long-running recognition...")
+    gcs_uri, gcs_blob = _upload_to_gcs(flac_path)
+    try:
+        audio = speech.RecognitionAudio(uri=gcs_uri)
+
+        print("   - Starting long-running recognition (this may take a few minutes)...")
+        operation = client.long_running_recognize(config=config, audio=audio, retry=STT_RETRY)
+
+        print("   - Waiting for transcription to complete...")
+        print("   - Note: Large files may take 10-30 minutes depending on audio length")
+        response = operation.result(timeout=3600)  # 60 minute timeout for very long videos
+    finally:
+        # Also delete on failure, so a timed-out or rejected job doesn't
+        # leave audio behind in the bucket
+        _delete_from_gcs(gcs_blob)
+
+    transcript_parts = []
+    for result in response.results:
+        # Get the highest confidence alternative
+        if result.alternatives:
+            transcript_parts.append(result.alternatives[0].transcript)
+
+    return " ".join(transcript_parts)
+
+
 def transcribe_youtube_audio(youtube_url: str, output_transcript_path: str):
     """
     Downloads audio from a YouTube URL, transcribes it using Google Cloud Speech-to-Text,
@@ -118,66 +290,36 @@ def transcribe_youtube_audio(youtube_url: str, output_transcript_path: str):
     # Get language from env or use default
     language_code = os.getenv("GOOGLE_STT_LANG", DEFAULT_LANGUAGE)
     
-    # 1. Download audio to a temporary file
-    print("-> Downloading audio...")
-    temp_audio_path = _download_audio_to_temp(youtube_url)
-
-    # 2. Convert to FLAC for better compatibility
-    print("-> Converting audio to FLAC...")
-    flac_path = _convert_to_flac(temp_audio_path)
+    # 1. Download audio and convert it to 16kHz mono FLAC in one streaming pass
+    print("-> Downloading audio as FLAC...")
+    flac_path = _download_audio_to_temp(youtube_url)
     
-    # 3. Upload to GCS for long-running recognition
-    # Note: long_running_recognize has a ~1 minute duration limit for inline audio,
-    # so we always use GCS for YouTube videos (which are typically longer)
     file_size = os.path.getsize(flac_path)
     print(f"   - Audio file is {file_size / 1024 / 1024:.1f}MB")
-    print("   - Uploading to Google Cloud Storage for long-running recognition...")
-    gcs_uri, gcs_blob = _upload_to_gcs(flac_path)
-    audio = speech.RecognitionAudio(uri=gcs_uri)
-    
-    # 4. Configure recognition request
-    print(f"-> Transcribing audio with Google Cloud Speech-to-Text ({language_code})...")
-    client = _get_speech_client()
-    
-    config = speech.RecognitionConfig(
-        encoding=speech.RecognitionConfig.AudioEncoding.FLAC,
-        sample_rate_hertz=16000,
-        language_code=language_code,
-        enable_automatic_punctuation=True,
-        model="latest_long",  # Optimized for long-form content like videos
-    )
-    
-    # 5. Perform transcription using long-running recognition
-    print("   - Starting long-running recognition (this may take a few minutes)...")
-    operation = client.long_running_recognize(config=config, audio=audio)
-    
-    print("   - Waiting for transcription to complete...")
-    print("   - Note: Large files may take 10-30 minutes depending on audio length")
-    response = operation.result(timeout=3600)  # 60 minute timeout for very long videos
-    
-    # 6. Extract transcript from response
-    transcript_parts = []
-    for result in response.results:
-        # Get the highest confidence alternative
-        if result.alternatives:
-            transcript_parts.append(result.alternatives[0].transcript)
-    
-    full_transcript = " ".join(transcript_parts)
 
-    # 7. Save the transcript to the specified output file
-    output_dir = os.path.dirname(output_transcript_path)
-    os.makedirs(output_dir, exist_ok=True)
-    
-    with open(output_transcript_path, "w", encoding='utf-8') as f:
-        f.write(full_transcript)
-
-    # 8. Clean up temporary files and GCS blob
-    if os.path.exists(temp_audio_path):
-        os.remove(temp_audio_path)
-    if os.path.exists(flac_path):
-        os.remove(flac_path)
-    if gcs_blob:
-        _delete_from_gcs(gcs_blob)
+    try:
+        # 2. Reuse an earlier transcript of identical audio instead of paying for STT again
+        # Keyed on the config too, so e.g. toggling GOOGLE_STT_ENHANCED transcribes again
+        cache_key = _audio_cache_key(flac_path, _build_recognition_config(language_code))
+        full_transcript = _load_cached_transcript(cache_key)
+
+        if full_transcript is not None:
+            print("   - Found cached transcript for this audio, skipping Speech-to-Text")
+        else:
+            full_transcript = _recognize_flac(flac_path, language_code)
+            _save_cached_transcript(cache_key, full_transcript)
+
+        # 3. Save the transcript to the specified output file
+        output_dir = os.path.dirname(output_transcript_path)
+        os.makedirs(output_dir, exist_ok=True)
+
+        with open(output_transcript_path, "w", encoding='utf-8') as f:
+            f.write(full_transcript)
+
+    finally:
+        # 4. Clean up temporary file
+        if os.path.exists(flac_path):
+            os.remove(flac_path)
 
     print(f"✅ Transcription complete. Saved to: {output_transcript_path}")
     return output_transcript_path
@@ -1,5 +1,7 @@
 import os
+import subprocess
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from dotenv import load_dotenv
 from openai import OpenAI
@@ -14,6 +16,10 @@ client = OpenAI()
 # We use 10 minutes (600 seconds) as chunk duration to stay well under limit.
 CHUNK_DURATION_MS = 10 * 60 * 1000  # 10 minutes in milliseconds
 
+# Chunks are transcribed concurrently (network-bound API calls).
+# Kept small to stay within Whisper's per-minute request limits.
+MAX_TRANSCRIPTION_WORKERS = 4
+
 def _download_audio_to_temp(url: str) -> str:
     """Downloads audio to a temporary file and returns the path."""
     temp_dir = tempfile.gettempdir()
@@ -36,37 +42,44 @@ def _download_audio_to_temp(url: str) -> str:
     
     return temp_audio_path
 
-def _split_audio_into_chunks(audio_path: str) -> list[str]:
+def _split_audio_into_chunks(audio_path: str, chunk_dir: str) -> list[str]:
     """
-    Splits an audio file into chunks of CHUNK_DURATION_MS milliseconds.
-    Returns a list of paths to temporary chunk files.
+    Splits an audio file into chunks of at most CHUNK_DURATION_MS milliseconds
+    inside chunk_dir and returns their paths in order. A single ffmpeg segment
+    muxer call stream-copies the MP3 frames, so nothing is decoded or re-encoded.
     """
-    audio = AudioSegment.from_mp3(audio_path)
-    duration_ms = len(audio)
-    
-    # If audio is short enough, no need to split
-    if duration_ms <= CHUNK_DURATION_MS:
-        return [audio_path]
-    
-    chunks = []
-    temp_dir = tempfile.gettempdir()
-    num_chunks = (duration_ms // CHUNK_DURATION_MS) + 1
-    
-    print(f"-> Audio is {duration_ms // 1000 // 60} minutes. Splitting into {num_chunks} chunks...")
-    
-    for i in range(num_chunks):
-        start_ms = i * CHUNK_DURATION_MS
-        end_ms = min((i + 1) * CHUNK_DURATION_MS, duration_ms)
-        
-        if start_ms >= duration_ms:
-            break
-            
-        chunk = audio[start_ms:end_ms]
-        chunk_path = os.path.join(temp_dir, f"transcription_chunk_{i}.mp3")
-        chunk.export(chunk_path, format="mp3")
-        chunks.append(chunk_path)
-    
-    return chunks
+    subprocess.run(
+        [
+            AudioSegment.converter,  # Same ffmpeg binary pydub is configured with
+            "-y",
+            "-loglevel", "error",
+            "-i", audio_path,
+            "-f", "segment",
+            "-segment_time", f"{CHUNK_DURATION_MS / 1000:.0f}",
+            "-reset_timestamps", "1",
+            "-c", "copy",
+            os.path.join(chunk_dir, "transcription_chunk_%03d.mp3"),
+        ],
+        check=True,
+        capture_output=True,
+    )
+
+    # Zero-padded names sort in playback order
+    return sorted(
+        os.path.join(chunk_dir, name)
+        for name in os.listdir(chunk_dir)
+        if name.startswith("transcription_chunk_")
+    )
+
+
+def _transcribe_chunk(chunk_path: str) -> str:
+    """Transcribes a single audio chunk with the Whisper API."""
+    with open(chunk_path, "rb") as audio_file:
+        return client.audio.transcriptions.create(
+            model="whisper-1", 
+            file=audio_file, 
+            response_format="text"
+        )
 
 
 def transcribe_youtube_audio(youtube_url: str, output_transcript_path: str):
@@ -84,28 +97,18 @@ def transcribe_youtube_audio(youtube_url: str, output_transcript_path: str):
     print("-> Downloading audio...")
     temp_audio_path = _download_audio_to_temp(youtube_url)
 
-    # 2. Split audio into chunks if needed (Whisper API has 25MB limit)
-    chunk_paths = _split_audio_into_chunks(temp_audio_path)
-    
-    # 3. Transcribe each chunk and combine results
-    print("-> Transcribing audio with Whisper API...")
-    transcript_parts = []
-    
-    for i, chunk_path in enumerate(chunk_paths):
+    # 2. Split audio into chunks (Whisper API has 25MB limit)
+    with tempfile.TemporaryDirectory(prefix="transcription_chunks_") as chunk_dir:
+        chunk_paths = _split_audio_into_chunks(temp_audio_path, chunk_dir)
+
+        # 3. Transcribe all chunks concurrently and combine results in order
+        print("-> Transcribing audio with Whisper API...")
         if len(chunk_paths) > 1:
-            print(f"   - Transcribing chunk {i + 1}/{len(chunk_paths)}...")
-        
-        with open(chunk_path, "rb") as audio_file:
-            transcript = client.audio.transcriptions.create(
-                model="whisper-1", 
-                file=audio_file, 
-                response_format="text"
-            )
-        transcript_parts.append(transcript)
-        
-        # Clean up chunk file (but not the original if it wasn't split)
-        if chunk_path != temp_audio_path:
-            os.remove(chunk_path)
+            print(f"   - Transcribing {len(chunk_paths)} chunks in parallel...")
+
+        with ThreadPoolExecutor(max_workers=MAX_TRANSCRIPTION_WORKERS) as executor:
+            # executor.map preserves input order, so parts line up with chunks
+            transcript_parts = list(executor.map(_transcribe_chunk, chunk_paths))
     
     # Combine all transcript parts
     full_transcript = " ".join(transcript_parts)
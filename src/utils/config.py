@@ -2,13 +2,19 @@
 Configuration utilities for model and voice selection across the pipeline.
 Reads from config/config.json to enable easy model swapping in Streamlit UI.
 """
+import os
 import json
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import TYPE_CHECKING, Dict, List, Any
 
+if TYPE_CHECKING:
+    from langchain_google_genai import ChatGoogleGenerativeAI
 
+
+@lru_cache(maxsize=None)
 def get_config_path() -> Path:
-    """Get the path to config.json config file."""
+    """Get the path to config.json config file (located once per process)."""
     # Find project root (where main.py lives)
     current = Path(__file__).resolve().parent
     while current != current.parent:
@@ -84,6 +90,23 @@ def set_prompting_llm(model: str) -> None:
     save_config(config)
 
 
+@lru_cache(maxsize=None)
+def get_chat_llm(model_name: str, temperature: float) -> "ChatGoogleGenerativeAI":
+    """
+    Get a Gemini chat model, built on first use and shared by later calls.
+    Keyed by model name, so a model switched in config.json takes effect
+    without restarting the app.
+    """
+    # Imported here so reading the config (e.g. in the UI) doesn't load LangChain
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+    return ChatGoogleGenerativeAI(
+        model=model_name,
+        google_api_key=os.getenv("GOOGLE_API_KEY"),
+        temperature=temperature,
+    )
+
+
 # ===== TEXT-TO-SPEECH =====
 
 def get_tts_voice() -> str:
@@ -3,6 +3,17 @@ from PIL import Image, ImageOps
 from PIL.Image import Resampling
 import numpy as np
 import os
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+def _load_frame(filepath: str, width: int, height: int) -> np.ndarray:
+    """Decodes an image and resizes it to a full video frame."""
+    with Image.open(filepath) as source:
+        img = source.convert("RGB")
+    img = ImageOps.exif_transpose(img)
+    img = img.resize((width, height), resample=Resampling.LANCZOS)
+    # asarray wraps the resized frame's pixel buffer instead of copying it again
+    return np.asarray(img)
 
 def compose_video(images_dir: str, audio_path: str, output_path: str, video_size=(1920, 1080), fade_duration=1.5, fps=24):
     """
@@ -28,17 +39,22 @@ def compose_video(images_dir: str, audio_path: str, output_path: str, video_size
         raise ValueError("No valid images found in the specified directory.")
 
     print(f"-> Found {len(image_files)} images to process.")
-    for filename in image_files:
-        filepath = os.path.join(images_dir, filename)
-        try:
-            img = Image.open(filepath).convert("RGB")
-            img = ImageOps.exif_transpose(img)
-            img = img.resize((width, height), resample=Resampling.LANCZOS)
-            img_array = np.array(img)
-            clip = ImageClip(img_array)
-            image_clips.append(clip)
-        except Exception as e:
-            print(f"Skipping {filename} due to error: {e}")
+    # Pillow releases the GIL while decoding and resizing, so frames are
+    # prepared on all cores; clips are still built in the original order.
+    # Each task runs in a copy of this context so worker output is routed the
+    # same way as the caller's (e.g. into the Streamlit log)
+    with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as executor:
+        frames = [
+            executor.submit(contextvars.copy_context().run,
+                            _load_frame, os.path.join(images_dir, filename), width, height)
+            for filename in image_files
+        ]
+        for filename, frame in zip(image_files, frames):
+            try:
+                clip = ImageClip(frame.result())
+                image_clips.append(clip)
+            except Exception as e:
+                print(f"Skipping {filename} due to error: {e}")
 
     if not image_clips:
         raise RuntimeError("Could not create any valid image clips.")
@@ -1,8 +1,9 @@
 import os
+import json
 import pytest
 from unittest.mock import patch, MagicMock
 
-from src.image_creation import create_images_from_prompts
+from src.image_creation import create_images_from_prompts, _get_imagen_model
 
 # A sample prompt file content
 PROMPTS_CONTENT = """
@@ -11,6 +12,15 @@ PROMPTS_CONTENT = """
 3. A spaceship landing in a forest.
 """
 
+
+@pytest.fixture(autouse=True)
+def fresh_imagen_model_cache():
+    """Keep a model loaded (and mocked) in one test from leaking into the next."""
+    _get_imagen_model.cache_clear()
+    yield
+    _get_imagen_model.cache_clear()
+
+
 @patch('src.image_creation.vertexai')
 @patch('src.image_creation.ImageGenerationModel')
 def test_create_images_from_prompts_unit(mock_image_model, mock_vertexai, tmp_path):
@@ -53,3 +63,55 @@ def test_create_images_from_prompts_unit(mock_image_model, mock_vertexai, tmp_pa
 
     # Check that a log file was created
     assert os.path.exists(os.path.join(result_dir, "_image_log.json"))
+
+
+@patch('src.image_creation.vertexai')
+@patch('src.image_creation.ImageGenerationModel')
+def test_create_images_from_prompts_continues_past_failures(mock_image_model, mock_vertexai, tmp_path):
+    """
+    A failed prompt is logged and skipped while the others (generated in
+    parallel) are still saved, and the log stays in prompt order.
+    """
+    temp_prompts_path = tmp_path / "prompts.txt"
+    temp_output_dir = tmp_path / "images"
+    temp_prompts_path.write_text(PROMPTS_CONTENT)
+
+    def fake_generate_images(prompt, **kwargs):
+        if "robot" in prompt:
+            raise RuntimeError("quota exceeded")
+        return MagicMock(images=[MagicMock()])
+
+    mock_model_instance = mock_image_model.from_pretrained.return_value
+    mock_model_instance.generate_images.side_effect = fake_generate_images
+
+    create_images_from_prompts(str(temp_prompts_path), str(temp_output_dir))
+
+    assert mock_model_instance.generate_images.call_count == 3
+    log_data = json.loads((temp_output_dir / "_image_log.json").read_text())
+    assert [entry["index"] for entry in log_data] == [1, 3]
+    assert log_data[0]["filepath"] == os.path.join(str(temp_output_dir), "001.png")
+
+
+@patch('src.image_creation.vertexai')
+@patch('src.image_creation.ImageGenerationModel')
+def test_create_images_from_prompts_skip_existing(mock_image_model, mock_vertexai, tmp_path):
+    """
+    With skip_existing, prompts whose image is already on disk are not sent
+    to Imagen again, but still appear in the log.
+    """
+    temp_prompts_path = tmp_path / "prompts.txt"
+    temp_output_dir = tmp_path / "images"
+    temp_prompts_path.write_text(PROMPTS_CONTENT)
+    temp_output_dir.mkdir()
+    (temp_output_dir / "002.png").touch()
+
+    mock_model_instance = mock_image_model.from_pretrained.return_value
+    mock_model_instance.generate_images.return_value.images = [MagicMock()]
+
+    create_images_from_prompts(str(temp_prompts_path), str(temp_output_dir), skip_existing=True)
+
+    prompts_sent = [call.kwargs["prompt"] for call in mock_model_instance.generate_images.call_args_list]
+    assert len(prompts_sent) == 2
+    assert not any("robot" in prompt for prompt in prompts_sent)
+    log_data = json.loads((temp_output_dir / "_image_log.json").read_text())
+    assert [entry["index"] for entry in log_data] == [1, 2, 3]
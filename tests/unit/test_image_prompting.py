@@ -3,28 +3,55 @@ import pytest
 from unittest.mock import patch, MagicMock
 from langchain_core.messages import AIMessage
 
-from src.image_prompting import _calculate_num_images, _split_summary_into_chunks, _generate_style_bible, generate_image_prompts
+from src.image_prompting import _calculate_num_images, _chunk_offsets, _split_summary_into_chunks, _generate_style_bible, generate_image_prompts
+
+
+@pytest.fixture(autouse=True)
+def isolated_style_bible_cache(tmp_path, monkeypatch):
+    """Keep cached style bibles from leaking between tests."""
+    cache_dir = tmp_path / "style_bible_cache"
+    monkeypatch.setattr('src.image_prompting.STYLE_BIBLE_CACHE_DIR', str(cache_dir))
+    return cache_dir
 
 # --- Tests for _calculate_num_images ---
 
-@patch('src.image_prompting.AudioSegment')
-def test_calculate_num_images(mock_audio_segment):
-    """Tests the image calculation logic with a mocked AudioSegment."""
-    # Mock the return value of from_mp3
-    mock_audio = mock_audio_segment.from_mp3.return_value
-    
+@patch('src.image_prompting.mediainfo')
+def test_calculate_num_images(mock_mediainfo):
+    """Tests the image calculation logic with a mocked duration probe."""
     # Test case 1: Exact multiple
-    mock_audio.__len__.return_value = 60 * 1000 # 60 seconds
+    mock_mediainfo.return_value = {"duration": "60.000000"} # 60 seconds
     assert _calculate_num_images("dummy_path.mp3", 15) == 4
 
     # Test case 2: Rounding up
-    mock_audio.__len__.return_value = 61 * 1000 # 61 seconds
+    mock_mediainfo.return_value = {"duration": "61.000000"} # 61 seconds
     assert _calculate_num_images("dummy_path.mp3", 15) == 5
 
     # Test case 3: Zero duration
-    mock_audio.__len__.return_value = 0
+    mock_mediainfo.return_value = {"duration": "0.000000"}
     assert _calculate_num_images("dummy_path.mp3", 15) == 0
 
+@patch('src.image_prompting.get_chat_llm')
+@patch('src.image_prompting.mediainfo')
+def test_generate_image_prompts_unreadable_audio_keeps_style_bible(mock_mediainfo, mock_get_llm, tmp_path, isolated_style_bible_cache):
+    """
+    An audio file whose duration can't be probed raises a clear error; the
+    style bible generated meanwhile is cached, so a rerun doesn't pay for it again.
+    """
+    mock_mediainfo.return_value = {}  # What mediainfo() returns when ffprobe fails
+    mock_get_llm.return_value.side_effect = [AIMessage(content="Warm film look. No text overlays.")]
+
+    summary_path = tmp_path / "1_summary.txt"
+    summary_path.write_text("word " * 30)
+    audio_path = tmp_path / "2_audio.mp3"
+    audio_path.write_text("fake audio")
+
+    with pytest.raises(RuntimeError, match="Could not read the duration"):
+        generate_image_prompts(str(summary_path), str(audio_path), str(tmp_path / "3_image_prompts.json"))
+
+    cached = list(isolated_style_bible_cache.iterdir())
+    assert len(cached) == 1
+    assert "Warm film look" in cached[0].read_text()
+
 # --- Tests for _split_summary_into_chunks ---
 
 def test_split_summary_into_chunks():
@@ -49,11 +76,34 @@ def test_split_summary_into_chunks():
     chunks_empty = _split_summary_into_chunks(summary_empty, 5)
     assert len(chunks_empty) == 0
 
+    # Test case 4: Remainder spread over chunks, so the chunk count matches the image count
+    summary_ten = "one two three four five six seven eight nine ten"
+    chunks_ten = _split_summary_into_chunks(summary_ten, 6)
+    assert len(chunks_ten) == 6
+    assert [len(chunk.split()) for chunk in chunks_ten] == [2, 2, 2, 2, 1, 1]
+
+    # Test case 5: Fewer words than chunks
+    chunks_short = _split_summary_into_chunks("one two", 5)
+    assert chunks_short == ["one", "two"]
+
+
+def test_chunk_offsets_keep_original_text():
+    """Chunks are slices of the summary, so punctuation and line breaks survive."""
+    summary = "Hello, world!\nThis is  a test.\n\nEnd here now"
+    offsets = _chunk_offsets(summary, 3)
+    assert [summary[start:end] for start, end in offsets] == [
+        "Hello, world!\nThis",
+        "is  a test.",
+        "End here now",
+    ]
+    assert _chunk_offsets("   \n ", 3) == []
+
 # --- Tests for _generate_style_bible ---
 
-@patch('src.image_prompting.llm')
-def test_generate_style_bible(mock_llm):
+@patch('src.image_prompting.get_chat_llm')
+def test_generate_style_bible(mock_get_llm):
     """Tests that _generate_style_bible calls the LLM and returns stripped output."""
+    mock_llm = mock_get_llm.return_value
     # When llm is mocked, LangChain wraps it as a RunnableLambda (callable).
     # The chain calls mock_llm(input) and passes the result to StrOutputParser.
     # StrOutputParser expects an AIMessage, so we return one.
@@ -70,14 +120,14 @@ def test_generate_style_bible(mock_llm):
 
 # --- Tests for generate_image_prompts with style bible ---
 
-@patch('src.image_prompting.llm')
-@patch('src.image_prompting.AudioSegment')
-def test_generate_image_prompts_creates_style_bible(mock_audio_segment, mock_llm, tmp_path):
+@patch('src.image_prompting.get_chat_llm')
+@patch('src.image_prompting.mediainfo')
+def test_generate_image_prompts_creates_style_bible(mock_mediainfo, mock_get_llm, tmp_path):
     """Tests that generate_image_prompts generates and saves a style bible."""
     # Setup mock audio (60 seconds = 3 images at 20s/image)
-    mock_audio = mock_audio_segment.from_mp3.return_value
-    mock_audio.__len__.return_value = 60 * 1000
+    mock_mediainfo.return_value = {"duration": "60.000000"}
 
+    mock_llm = mock_get_llm.return_value
     # Mock LLM: first call = style bible, next 3 = scene prompts
     mock_llm.side_effect = [
         AIMessage(content="Cool blue documentary style. Shallow depth of field. No text overlays, no watermarks, no logos rendered in the image."),
@@ -110,14 +160,14 @@ def test_generate_image_prompts_creates_style_bible(mock_audio_segment, mock_llm
     assert lines[1].startswith("2.")
     assert lines[2].startswith("3.")
 
-@patch('src.image_prompting.llm')
-@patch('src.image_prompting.AudioSegment')
-def test_generate_image_prompts_loads_existing_style_bible(mock_audio_segment, mock_llm, tmp_path):
+@patch('src.image_prompting.get_chat_llm')
+@patch('src.image_prompting.mediainfo')
+def test_generate_image_prompts_loads_existing_style_bible(mock_mediainfo, mock_get_llm, tmp_path):
     """Tests that generate_image_prompts loads an existing style bible instead of regenerating."""
     # Setup mock audio (40 seconds = 2 images at 20s/image)
-    mock_audio = mock_audio_segment.from_mp3.return_value
-    mock_audio.__len__.return_value = 40 * 1000
+    mock_mediainfo.return_value = {"duration": "40.000000"}
 
+    mock_llm = mock_get_llm.return_value
     # Mock LLM — should only be called for scene prompts (style bible loaded from file)
     mock_llm.side_effect = [
         AIMessage(content="A photorealistic wide shot of a modern office"),
@@ -148,3 +198,39 @@ def test_generate_image_prompts_loads_existing_style_bible(mock_audio_segment, m
 
     # LLM was called exactly 2 times (scene prompts only, no style bible generation)
     assert mock_llm.call_count == 2
+
+@patch('src.image_prompting.get_chat_llm')
+@patch('src.image_prompting.mediainfo')
+def test_generate_image_prompts_caches_style_bible_by_script(mock_mediainfo, mock_get_llm, tmp_path):
+    """The same script reuses its cached style bible (even in another project); a rewritten script gets a new one."""
+    mock_mediainfo.return_value = {"duration": "20.000000"}  # 1 image
+    mock_llm = mock_get_llm.return_value
+    mock_llm.side_effect = [
+        AIMessage(content="First style bible."),
+        AIMessage(content="Prompt for project A"),
+        AIMessage(content="Prompt for project B"),
+        AIMessage(content="Second style bible."),
+        AIMessage(content="Prompt for rewritten script"),
+    ]
+
+    project_a, project_b = tmp_path / "a", tmp_path / "b"
+    for project in (project_a, project_b):
+        project.mkdir()
+        (project / "1_summary.txt").write_text("The same script.")
+
+    generate_image_prompts(str(project_a / "1_summary.txt"), "audio.mp3", str(project_a / "3_image_prompts.json"))
+    generate_image_prompts(str(project_b / "1_summary.txt"), "audio.mp3", str(project_b / "3_image_prompts.json"))
+
+    # One bible generation serves both projects
+    assert mock_llm.call_count == 3
+    assert (project_b / "3a_style_bible.txt").read_text() == "First style bible."
+
+    # A summary rewritten after the bible invalidates it, even though 3a_style_bible.txt exists
+    summary_a = project_a / "1_summary.txt"
+    summary_a.write_text("A rewritten script.")
+    bible_mtime = os.path.getmtime(project_a / "3a_style_bible.txt")
+    os.utime(summary_a, (bible_mtime + 10, bible_mtime + 10))
+    generate_image_prompts(str(summary_a), "audio.mp3", str(project_a / "3_image_prompts.json"))
+
+    assert mock_llm.call_count == 5
+    assert (project_a / "3a_style_bible.txt").read_text() == "Second style bible."
@@ -1,6 +1,6 @@
 import pytest
 
-from src.metadata_generation import parse_metadata_output
+from src.metadata_generation import parse_metadata_output, _MetadataParser
 
 # A realistic, multi-line raw output from the LLM
 MOCK_LLM_OUTPUT = """
@@ -41,9 +41,22 @@ def test_parse_metadata_output_variant():
     assert parsed_data["description"] == "A single line description."
     assert parsed_data["hashtags"] == ["#tagA", "#tagB"]
 
+def test_parse_metadata_output_ignores_inline_titles_header():
+    """Text on the TITLES: header line itself is not taken as a title."""
+    parsed_data = parse_metadata_output("TITLES: - Not a title\n- Title A\nDESCRIPTION: Text.")
+    assert parsed_data["titles"] == ["Title A"]
+    assert parsed_data["description"] == "Text."
+
 def test_parse_metadata_output_empty():
     """Tests the parsing logic with an empty input."""
     parsed_data = parse_metadata_output("")
     assert parsed_data["titles"] == []
     assert parsed_data["description"] == ""
     assert parsed_data["hashtags"] == []
+
+def test_metadata_parser_streamed_in_pieces():
+    """Feeding the output in arbitrary pieces (split mid-line) parses the same as all at once."""
+    parser = _MetadataParser()
+    for start in range(0, len(MOCK_LLM_OUTPUT), 7):
+        parser.feed(MOCK_LLM_OUTPUT[start:start + 7])
+    assert parser.close() == parse_metadata_output(MOCK_LLM_OUTPUT)
@@ -1,21 +1,19 @@
 import os
 import pytest
 from unittest.mock import patch, MagicMock
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
 
 from src.summarization import summarize_transcript
 
-@patch('src.summarization.create_stuff_documents_chain')
-@patch('src.summarization.TextLoader')
-@patch('src.summarization.ChatGoogleGenerativeAI')
+@patch('src.summarization.get_chat_llm')
 def test_summarize_transcript_unit(
-    mock_chat_google,
-    mock_text_loader,
-    mock_create_chain,
+    mock_get_llm,
     tmp_path
 ):
     """
     Unit test for summarize_transcript.
-    Mocks the entire LangChain chain to test the function's orchestration.
+    Mocks the LLM to test the function's orchestration.
     """
     # 1. Setup
     # Define temporary file paths using the tmp_path fixture
@@ -25,24 +23,20 @@ def test_summarize_transcript_unit(
     # Create a dummy transcript file
     temp_transcript_path.write_text("This is a test transcript.")
 
-    # Mock the loader to return dummy documents
-    mock_text_loader.return_value.load.return_value = [MagicMock(page_content="dummy content")]
-
-    # Mock the chain and its invocation to return a specific result
-    mock_chain_instance = MagicMock()
-    mock_chain_instance.invoke.return_value = "This is the mocked summary."
-    mock_create_chain.return_value = mock_chain_instance
+    # Mock the LLM to return a specific result
+    prompts_seen = []
+    def fake_llm(prompt_value):
+        prompts_seen.append(prompt_value.to_string())
+        return AIMessage(content="This is the mocked summary.")
+    mock_get_llm.return_value = RunnableLambda(fake_llm)
 
     # 2. Execution
     result_path = summarize_transcript(str(temp_transcript_path), str(temp_summary_path))
 
     # 3. Verification
-    # Verify that the loader was called with the correct transcript path
-    mock_text_loader.assert_called_once_with(str(temp_transcript_path))
-
-    # Verify that the chain was created and invoked
-    mock_create_chain.assert_called_once()
-    mock_chain_instance.invoke.assert_called_once()
+    # Verify the LLM was invoked once, with the transcript in the prompt
+    assert len(prompts_seen) == 1
+    assert "This is a test transcript." in prompts_seen[0]
 
     # Verify the function returned the correct path
     assert result_path == str(temp_summary_path)
@@ -52,3 +46,34 @@ def test_summarize_transcript_unit(
     with open(temp_summary_path, "r") as f:
         content = f.read()
     assert content == "This is the mocked summary."
+
+
+def test_summarize_transcript_condenses_long_transcripts(tmp_path):
+    """
+    Transcripts over MAP_REDUCE_THRESHOLD_CHARS are condensed section by
+    section first, and the script prompt runs over the notes, in order.
+    """
+    import src.summarization as summarization
+
+    transcript_path = tmp_path / "transcript.txt"
+    transcript_path.write_text("word " * (summarization.MAP_REDUCE_THRESHOLD_CHARS // 5 + 100))
+
+    section_prompts = []
+    script_prompts = []
+    def fake_llm(prompt_value):
+        text = prompt_value.to_string()
+        if "REMINDER:" in text:
+            script_prompts.append(text)
+            return AIMessage(content="Final script.")
+        section_prompts.append(text)
+        return AIMessage(content=f"notes {len(section_prompts)}")
+
+    with patch.object(summarization, 'get_chat_llm', return_value=RunnableLambda(fake_llm)):
+        summarize_transcript(str(transcript_path), str(tmp_path / "summary.txt"))
+
+    assert len(section_prompts) > 1
+    assert len(script_prompts) == 1
+    # The script prompt sees every section's notes, not the raw transcript
+    assert all(f"notes {i}" in script_prompts[0] for i in range(1, len(section_prompts) + 1))
+    assert "word word word" not in script_prompts[0]
+    assert (tmp_path / "summary.txt").read_text() == "Final script."
@@ -2,37 +2,49 @@ import os
 import pytest
 from unittest.mock import patch, MagicMock
 
-from src.transcription import transcribe_youtube_audio
+from src.transcription import transcribe_youtube_audio, _download_audio_to_temp, _build_recognition_config, _audio_cache_key
 
 # Define a dummy URL for testing
 TEST_YOUTUBE_URL = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+TEST_GCS_URI = "gs://test-bucket/transcription-temp/audio.flac"
+LONG_AUDIO_SECONDS = 600.0
 
+
+@pytest.fixture(autouse=True)
+def isolated_transcript_cache(tmp_path, monkeypatch):
+    """Keep cached transcripts from leaking between tests."""
+    cache_dir = tmp_path / "transcript_cache"
+    monkeypatch.setattr('src.transcription.TRANSCRIPT_CACHE_DIR', str(cache_dir))
+    return cache_dir
+
+
+@patch('src.transcription._get_audio_duration', return_value=LONG_AUDIO_SECONDS)
+@patch('src.transcription._delete_from_gcs')
+@patch('src.transcription._upload_to_gcs')
 @patch('src.transcription._get_speech_client')
-@patch('src.transcription._convert_to_flac')
 @patch('src.transcription._download_audio_to_temp')
 def test_transcribe_youtube_audio_unit(
     mock_downloader,
-    mock_convert_flac,
     mock_get_client,
+    mock_upload,
+    mock_delete,
+    mock_duration,
     tmp_path
 ):
     """
     Unit test for transcribe_youtube_audio.
-    Mocks the downloader, FLAC converter, and Google Speech client.
+    Mocks the downloader and Google Speech client.
     """
     # 1. Setup Mocks and Temporary Files
     test_output_path = tmp_path / "transcript.txt"
-    dummy_audio_path = tmp_path / "dummy_audio.mp3"
     dummy_flac_path = tmp_path / "dummy_audio.flac"
 
     # Create dummy files
-    with open(dummy_audio_path, "w") as f:
-        f.write("dummy audio")
     with open(dummy_flac_path, "w") as f:
         f.write("dummy flac")
     
-    mock_downloader.return_value = str(dummy_audio_path)
-    mock_convert_flac.return_value = str(dummy_flac_path)
+    mock_downloader.return_value = str(dummy_flac_path)
+    mock_upload.return_value = (TEST_GCS_URI, MagicMock())
 
     # Mock the Google Speech client
     mock_client = MagicMock()
@@ -57,8 +69,12 @@ def test_transcribe_youtube_audio_unit(
 
     # 3. Verification
     mock_downloader.assert_called_once_with(TEST_YOUTUBE_URL)
-    mock_convert_flac.assert_called_once_with(str(dummy_audio_path))
+    mock_upload.assert_called_once_with(str(dummy_flac_path))
     mock_client.long_running_recognize.assert_called_once()
+    audio_arg = mock_client.long_running_recognize.call_args.kwargs["audio"]
+    assert audio_arg.uri == TEST_GCS_URI
+    assert mock_client.long_running_recognize.call_args.kwargs["retry"] is not None
+    mock_delete.assert_called_once()
 
     assert result_path == str(test_output_path)
     assert os.path.exists(test_output_path)
@@ -68,24 +84,23 @@ def test_transcribe_youtube_audio_unit(
     assert content == "This is a mocked transcript."
 
 
+@patch('src.transcription._get_audio_duration', return_value=LONG_AUDIO_SECONDS)
+@patch('src.transcription._delete_from_gcs')
+@patch('src.transcription._upload_to_gcs')
 @patch('src.transcription._get_speech_client')
-@patch('src.transcription._convert_to_flac')
 @patch('src.transcription._download_audio_to_temp')
-def test_transcribe_rejects_directory_path(mock_downloader, mock_convert_flac, mock_get_client, tmp_path):
+def test_transcribe_rejects_directory_path(mock_downloader, mock_get_client, mock_upload, mock_delete, mock_duration, tmp_path):
     """
     Regression test: transcribe_youtube_audio must receive a file path, not a directory.
     If given a directory, it should fail (IsADirectoryError).
     """
-    dummy_audio_path = tmp_path / "dummy_audio.mp3"
     dummy_flac_path = tmp_path / "dummy_audio.flac"
     
-    with open(dummy_audio_path, "w") as f:
-        f.write("dummy audio")
     with open(dummy_flac_path, "w") as f:
         f.write("dummy flac")
         
-    mock_downloader.return_value = str(dummy_audio_path)
-    mock_convert_flac.return_value = str(dummy_flac_path)
+    mock_downloader.return_value = str(dummy_flac_path)
+    mock_upload.return_value = (TEST_GCS_URI, MagicMock())
     
     # Mock client
     mock_client = MagicMock()
@@ -101,25 +116,24 @@ def test_transcribe_rejects_directory_path(mock_downloader, mock_convert_flac, m
         transcribe_youtube_audio(TEST_YOUTUBE_URL, str(tmp_path))
 
 
+@patch('src.transcription._get_audio_duration', return_value=LONG_AUDIO_SECONDS)
+@patch('src.transcription._delete_from_gcs')
+@patch('src.transcription._upload_to_gcs')
 @patch('src.transcription._get_speech_client')
-@patch('src.transcription._convert_to_flac')
 @patch('src.transcription._download_audio_to_temp')
-def test_transcribe_multiple_results(mock_downloader, mock_convert_flac, mock_get_client, tmp_path):
+def test_transcribe_multiple_results(mock_downloader, mock_get_client, mock_upload, mock_delete, mock_duration, tmp_path):
     """
     Test that multiple speech results are combined correctly.
     """
     test_output_path = tmp_path / "transcript.txt"
-    dummy_audio_path = tmp_path / "dummy_audio.mp3"
     dummy_flac_path = tmp_path / "dummy_audio.flac"
 
     # Create dummy files
-    with open(dummy_audio_path, "w") as f:
-        f.write("dummy audio")
     with open(dummy_flac_path, "w") as f:
         f.write("dummy flac")
 
-    mock_downloader.return_value = str(dummy_audio_path)
-    mock_convert_flac.return_value = str(dummy_flac_path)
+    mock_downloader.return_value = str(dummy_flac_path)
+    mock_upload.return_value = (TEST_GCS_URI, MagicMock())
     
     # Mock client with multiple results
     mock_client = MagicMock()
@@ -149,3 +163,217 @@ def test_transcribe_multiple_results(mock_downloader, mock_convert_flac, mock_ge
     with open(test_output_path, "r") as f:
         content = f.read()
     assert content == "Part one. Part two."
+
+
+@patch('src.transcription._get_audio_duration', return_value=LONG_AUDIO_SECONDS)
+@patch('src.transcription._delete_from_gcs')
+@patch('src.transcription._upload_to_gcs')
+@patch('src.transcription._get_speech_client')
+@patch('src.transcription._download_audio_to_temp')
+def test_transcribe_cleans_up_gcs_on_failure(mock_downloader, mock_get_client, mock_upload, mock_delete, mock_duration, tmp_path):
+    """
+    The uploaded GCS blob and temp audio file are removed even when recognition fails.
+    """
+    dummy_flac_path = tmp_path / "dummy_audio.flac"
+    dummy_flac_path.write_text("dummy flac")
+
+    mock_downloader.return_value = str(dummy_flac_path)
+    mock_blob = MagicMock()
+    mock_upload.return_value = (TEST_GCS_URI, mock_blob)
+
+    mock_client = MagicMock()
+    mock_get_client.return_value = mock_client
+    mock_client.long_running_recognize.return_value.result.side_effect = TimeoutError("timed out")
+
+    with pytest.raises(TimeoutError):
+        transcribe_youtube_audio(TEST_YOUTUBE_URL, str(tmp_path / "transcript.txt"))
+
+    mock_delete.assert_called_once_with(mock_blob)
+    assert not dummy_flac_path.exists()
+
+
+@patch('src.transcription._get_audio_duration', return_value=45.0)
+@patch('src.transcription._delete_from_gcs')
+@patch('src.transcription._upload_to_gcs')
+@patch('src.transcription._get_speech_client')
+@patch('src.transcription._download_audio_to_temp')
+def test_transcribe_streams_short_audio(mock_downloader, mock_get_client, mock_upload, mock_delete, mock_duration, tmp_path):
+    """
+    Short clips are streamed directly to Speech-to-Text without a GCS upload.
+    """
+    test_output_path = tmp_path / "transcript.txt"
+    dummy_flac_path = tmp_path / "dummy_audio.flac"
+    dummy_flac_path.write_bytes(b"x" * 40000)
+
+    mock_downloader.return_value = str(dummy_flac_path)
+
+    final_result = MagicMock(is_final=True)
+    final_result.alternatives = [MagicMock(transcript="Streamed transcript.")]
+    interim_result = MagicMock(is_final=False)
+    interim_result.alternatives = [MagicMock(transcript="Stream")]
+
+    sent_chunks = []
+
+    def fake_streaming_recognize(streaming_config, requests):
+        sent_chunks.extend(request.audio_content for request in requests)
+        return [MagicMock(results=[interim_result]), MagicMock(results=[final_result])]
+
+    mock_client = MagicMock()
+    mock_client.streaming_recognize.side_effect = fake_streaming_recognize
+    mock_get_client.return_value = mock_client
+
+    transcribe_youtube_audio(TEST_YOUTUBE_URL, str(test_output_path))
+
+    mock_upload.assert_not_called()
+    mock_delete.assert_not_called()
+    mock_client.long_running_recognize.assert_not_called()
+    assert b"".join(sent_chunks) == b"x" * 40000
+    assert len(sent_chunks) > 1
+    assert test_output_path.read_text() == "Streamed transcript."
+    assert not dummy_flac_path.exists()
+
+
+@patch('src.transcription._get_audio_duration', return_value=LONG_AUDIO_SECONDS)
+@patch('src.transcription._delete_from_gcs')
+@patch('src.transcription._upload_to_gcs')
+@patch('src.transcription._get_speech_client')
+@patch('src.transcription._download_audio_to_temp')
+def test_transcribe_reuses_cached_transcript(mock_downloader, mock_get_client, mock_upload, mock_delete, mock_duration, tmp_path):
+    """
+    Transcribing identical audio a second time is served from the transcript cache.
+    """
+    def download_identical_audio(url):
+        dummy_flac_path = tmp_path / "dummy_audio.flac"
+        dummy_flac_path.write_text("identical flac")
+        return str(dummy_flac_path)
+
+    mock_downloader.side_effect = download_identical_audio
+    mock_upload.return_value = (TEST_GCS_URI, MagicMock())
+
+    mock_client = MagicMock()
+    mock_get_client.return_value = mock_client
+    mock_result = MagicMock()
+    mock_result.alternatives = [MagicMock(transcript="Cached transcript.")]
+    mock_client.long_running_recognize.return_value.result.return_value = MagicMock(results=[mock_result])
+
+    first_output = tmp_path / "first" / "transcript.txt"
+    second_output = tmp_path / "second" / "transcript.txt"
+    transcribe_youtube_audio(TEST_YOUTUBE_URL, str(first_output))
+    transcribe_youtube_audio(TEST_YOUTUBE_URL, str(second_output))
+
+    assert mock_client.long_running_recognize.call_count == 1
+    assert mock_upload.call_count == 1
+    assert second_output.read_text() == "Cached transcript."
+
+
+@patch('src.transcription.subprocess.Popen')
+def test_download_audio_streams_ytdlp_into_ffmpeg(mock_popen):
+    """
+    yt-dlp output is piped straight into ffmpeg, which writes mono 16kHz FLAC.
+    """
+    downloader = MagicMock(returncode=0)
+    converter = MagicMock(returncode=0)
+    converter.communicate.return_value = (None, b"")
+    mock_popen.side_effect = [downloader, converter]
+
+    flac_path = _download_audio_to_temp(TEST_YOUTUBE_URL)
+
+    assert flac_path.endswith(".flac")
+    ytdlp_cmd = mock_popen.call_args_list[0].args[0]
+    assert ytdlp_cmd[ytdlp_cmd.index("--output") + 1] == "-"
+    assert ytdlp_cmd[-1] == TEST_YOUTUBE_URL
+
+    ffmpeg_call = mock_popen.call_args_list[1]
+    ffmpeg_cmd = ffmpeg_call.args[0]
+    assert ffmpeg_call.kwargs["stdin"] is downloader.stdout
+    assert ffmpeg_cmd[ffmpeg_cmd.index("-i") + 1] == "pipe:0"
+    assert ffmpeg_cmd[ffmpeg_cmd.index("-ac") + 1] == "1"
+    assert ffmpeg_cmd[ffmpeg_cmd.index("-ar") + 1] == "16000"
+    assert ffmpeg_cmd[-1] == flac_path
+    downloader.stdout.close.assert_called_once()
+
+
+@patch('src.transcription.subprocess.Popen')
+def test_download_audio_raises_when_ytdlp_fails(mock_popen):
+    """
+    A failed download surfaces as an error instead of an empty FLAC file.
+    """
+    downloader = MagicMock(returncode=1)
+    converter = MagicMock(returncode=1)
+    converter.communicate.return_value = (None, b"pipe:0: Invalid data")
+    mock_popen.side_effect = [downloader, converter]
+
+    with pytest.raises(RuntimeError, match="yt-dlp failed"):
+        _download_audio_to_temp(TEST_YOUTUBE_URL)
+
+
+def test_recognition_config_defaults_to_latest_long(monkeypatch):
+    """
+    Without GOOGLE_STT_ENHANCED, the faster latest_long model is used.
+    """
+    monkeypatch.delenv("GOOGLE_STT_ENHANCED", raising=False)
+
+    config = _build_recognition_config("en-US")
+
+    assert config.model == "latest_long"
+    assert not config.use_enhanced
+    assert config.enable_automatic_punctuation
+
+
+def test_recognition_config_enhanced_flag(monkeypatch):
+    """
+    GOOGLE_STT_ENHANCED=true switches to the enhanced video model.
+    """
+    monkeypatch.setenv("GOOGLE_STT_ENHANCED", "true")
+
+    config = _build_recognition_config("en-US")
+
+    assert config.model == "video"
+    assert config.use_enhanced
+
+
+def test_audio_cache_key_covers_recognition_config(monkeypatch, tmp_path):
+    """
+    The same audio transcribed with a different model gets a different cache key.
+    """
+    flac_path = tmp_path / "audio.flac"
+    flac_path.write_bytes(b"identical flac")
+
+    monkeypatch.delenv("GOOGLE_STT_ENHANCED", raising=False)
+    default_key = _audio_cache_key(str(flac_path), _build_recognition_config("en-US"))
+    monkeypatch.setenv("GOOGLE_STT_ENHANCED", "true")
+    enhanced_key = _audio_cache_key(str(flac_path), _build_recognition_config("en-US"))
+
+    assert default_key != enhanced_key
+    assert enhanced_key == _audio_cache_key(str(flac_path), _build_recognition_config("en-US"))
+    assert enhanced_key != _audio_cache_key(str(flac_path), _build_recognition_config("de-DE"))
+
+
+@patch('src.transcription._get_audio_duration', return_value=45.0)
+@patch('src.transcription._get_speech_client')
+@patch('src.transcription._download_audio_to_temp')
+def test_transcribe_retries_transient_stt_errors(mock_downloader, mock_get_client, mock_duration, tmp_path):
+    """
+    A transient Speech-to-Text error (e.g. 503) is retried instead of failing the run.
+    """
+    from google.api_core import exceptions
+
+    dummy_flac_path = tmp_path / "dummy_audio.flac"
+    dummy_flac_path.write_bytes(b"flac bytes")
+    mock_downloader.return_value = str(dummy_flac_path)
+
+    final_result = MagicMock(is_final=True)
+    final_result.alternatives = [MagicMock(transcript="Recovered transcript.")]
+    mock_client = MagicMock()
+    mock_client.streaming_recognize.side_effect = [
+        exceptions.ServiceUnavailable("try again"),
+        [MagicMock(results=[final_result])],
+    ]
+    mock_get_client.return_value = mock_client
+
+    test_output_path = tmp_path / "transcript.txt"
+    with patch('time.sleep'):
+        transcribe_youtube_audio(TEST_YOUTUBE_URL, str(test_output_path))
+
+    assert mock_client.streaming_recognize.call_count == 2
+    assert test_output_path.read_text() == "Recovered transcript."